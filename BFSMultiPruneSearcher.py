@@ -3,7 +3,8 @@
 
 
 
-from display import Displayable, visualize
+from searchCore import Displayable, Path, arcs_path, parent_arcs, visualize
+from searchFrontier import FIFOFrontier
 
 
 class BFSMultiPruneSearcher(Displayable):
@@ -12,25 +13,44 @@ class BFSMultiPruneSearcher(Displayable):
     This does depth-first search unless overridden
     """
 
-    def __init__(self, problem):
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem, frontier_class=FIFOFrontier, prune_on_enqueue=False):
         """creates a searcher from a problem
+        *frontier_class* is called with no arguments to make the frontier
+        (see searchFrontier); the default FIFO queue gives breadth-first order.
+        With *prune_on_enqueue* nodes are marked visited when they are added to
+        the frontier, the frontier holds bare nodes, and each node keeps only
+        the arc it was reached by; a Path is built once, for the goal.  Marking
+        on enqueue only keeps shortest paths in FIFO order, so it requires
+        FIFOFrontier; other frontiers raise ValueError.
         """
+        if prune_on_enqueue and frontier_class is not FIFOFrontier:
+            raise ValueError("prune_on_enqueue needs FIFOFrontier, got %s" % (frontier_class.__name__,))
         self.problem = problem
+        self.frontier_class = frontier_class
+        self.prune_on_enqueue = prune_on_enqueue
         self.initialize_frontier()
         self.num_expanded = 0
-        self.add_to_frontier(Path(problem.start_node()))
         super().__init__()
         self.max_display_level
-        self.visited = set()  # pruning
+        if prune_on_enqueue:
+            start = problem.start_node()
+            self.parent = {start: None}  # node -> arc it was first reached by
+            self.visited = self.parent  # pruning
+            self.add_to_frontier(start)
+        else:
+            self.visited = set()  # pruning
+            self.add_to_frontier(Path(problem.start_node()))
 
     def initialize_frontier(self):
-        self.frontier = []
+        self.frontier = self.frontier_class()
 
     def empty_frontier(self):
-        return self.frontier == []
+        return not self.frontier
 
     def add_to_frontier(self, path):
-        self.frontier.append(path)
+        self.frontier.add(path)
 
     @visualize
     def search(self):
@@ -38,26 +58,76 @@ class BFSMultiPruneSearcher(Displayable):
         to a goal node.
         Returns None if no path exists.
         """
+        if self.prune_on_enqueue:
+            return self.search_on_enqueue()
+        stats = self.stats
         while not self.empty_frontier():
-            path = self.frontier.pop(0)  # dir([])    pop
+            if stats is not None:
+                stats.frontier_size(len(self.frontier))
+            path = self.frontier.pop()
             if path.end() not in self.visited:  # don't check repeats
                 self.display(2, "Expanding:", path, "(cost:", path.cost, ")")
                 self.visited.add(path.end())  # add path to the visited list
                 self.num_expanded += 1
+                if stats is not None:
+                    stats.expanded += 1
                 if self.problem.is_goal(path.end()):  # solution found
                     self.display(1, self.num_expanded, "paths have been expanded and",
                                 len(self.frontier), "paths remain in the frontier")
                     self.solution = path  # store the solution found
+                    if stats is not None:
+                        stats.visited = len(self.visited)
                     return path
                 else:
                     neighs = self.problem.neighbors(path.end())
                     self.display(3, "Neighbors are", neighs)
+                    if stats is not None:
+                        stats.generated += len(neighs)
                     for arc in reversed(neighs):
                             self.add_to_frontier(Path(path, arc))
                 self.display(3, "Frontier:", self.frontier)
+            elif stats is not None:
+                stats.pruned += 1
+        if stats is not None:
+            stats.visited = len(self.visited)
         self.display(1, "No (more) solutions. Total of",
                      self.num_expanded, "paths expanded.")
 
+    def search_on_enqueue(self):
+        """search() for prune_on_enqueue mode; the frontier holds nodes."""
+        parent = self.parent
+        stats = self.stats
+        while not self.empty_frontier():
+            if stats is not None:
+                stats.frontier_size(len(self.frontier))
+            node = self.frontier.pop()
+            self.display(2, "Expanding:", node)
+            self.num_expanded += 1
+            if stats is not None:
+                stats.expanded += 1
+            if self.problem.is_goal(node):  # solution found
+                self.display(1, self.num_expanded, "paths have been expanded and",
+                             len(self.frontier), "paths remain in the frontier")
+                self.solution = self.path_to(node)  # store the solution found
+                if stats is not None:
+                    stats.visited = len(parent)
+                return self.solution
+            neighs = self.problem.neighbors(node)
+            self.display(3, "Neighbors are", neighs)
+            if stats is not None:
+                stats.generated += len(neighs)
+            for arc in reversed(neighs):
+                if arc.to_node not in parent:  # don't enqueue repeats
+                    parent[arc.to_node] = arc
+                    self.add_to_frontier(arc.to_node)
+                elif stats is not None:
+                    stats.pruned += 1
+            self.display(3, "Frontier:", self.frontier)
+        if stats is not None:
+            stats.visited = len(parent)
+        self.display(1, "No (more) solutions. Total of",
+                     self.num_expanded, "paths expanded.")
 
-import heapq  # part of the Python standard library
-from searchProblem import Path
\ No newline at end of file
+    def path_to(self, node):
+        """Build the Path from the start to *node* by following parent arcs."""
+        return arcs_path(self.problem.start_node(), parent_arcs(self.parent, node))
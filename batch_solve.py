@@ -0,0 +1,184 @@
+#batch_solve.py
+#CPOFFWEBSTER
+"""
+Solve many .blx boards across a pool of worker processes:
+
+    python batch_solve.py boards/ 'generated/*.blx' --workers 8 --timeout 30 -o results.jsonl
+
+Each board becomes one JSON line, written as soon as it finishes, with the
+board file, status (solved, unsolvable, timeout or error), solution action
+string, length, paths expanded and seconds taken.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import glob
+import json
+import os
+import signal
+import sys
+import time
+
+from bloxorz import Board
+from bloxorz_problem import BloxorzProblem, CompiledBloxorzProblem, path_actions
+from BFSMultiPruneSearcher import BFSMultiPruneSearcher
+from searchAStar import AStarSearcher, IDAStarSearcher
+from searchBiDir import BidirectionalSearcher
+from searchBoundedBFS import BoundedBFSSearcher
+
+SEARCHERS = {
+    'bfs': BFSMultiPruneSearcher,
+    'bfs-enqueue': lambda problem: BFSMultiPruneSearcher(problem, prune_on_enqueue=True),
+    'bidirectional': BidirectionalSearcher,
+    'astar': AStarSearcher,
+    'idastar': IDAStarSearcher,  # slow to give up on unsolvable boards the precheck misses
+    'bounded': BoundedBFSSearcher,
+}
+
+# searchers that read only the board get the plain problem: compiling the
+# StateSpace would cost the memory they exist to save
+PROBLEMS = {
+    'bounded': BloxorzProblem,
+}
+
+
+class SolveTimeout(Exception):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise SolveTimeout()
+
+
+def board_files(patterns):
+    """Expand directories (to their *.blx and *.blx2 files) and glob patterns, in order, without repeats."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.blx')) + glob.glob(os.path.join(pattern, '*.blx2'))
+        else:
+            matches = glob.glob(pattern)
+        for file_name in sorted(matches):
+            if file_name not in files:
+                files.append(file_name)
+    return files
+
+
+def solve_file(file_name, searcher_name='bfs', timeout=None, compiled=True):
+    """
+    Solve one board file in the current process and return its result record.
+    *timeout* seconds are enforced with SIGALRM where the platform has it.
+    """
+    record = {'board': file_name}
+    begin = time.perf_counter()
+    use_alarm = timeout is not None and hasattr(signal, 'setitimer')
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    searcher = None
+    try:
+        board = Board.load_board(file_name)
+        if board.unreachable_goal():
+            record.update(status='unsolvable', solution=None, length=None, expanded=0)
+        else:
+            default = CompiledBloxorzProblem if compiled else BloxorzProblem
+            problem = PROBLEMS.get(searcher_name, default)(board)
+            searcher = SEARCHERS[searcher_name](problem)
+            searcher.max_display_level = 0
+            path = searcher.search()
+            if path is None:
+                record.update(status='unsolvable', solution=None, length=None)
+            else:
+                record.update(status='solved', solution=path_actions(path), length=path.cost)
+    except SolveTimeout:
+        record.update(status='timeout')
+    except Exception as error:
+        record.update(status='error', error='%s: %s' % (type(error).__name__, error))
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    if searcher is not None:
+        record['expanded'] = searcher.num_expanded
+    record['seconds'] = round(time.perf_counter() - begin, 6)
+    return record
+
+
+def solve_all(files, output, searcher_name='bfs', workers=None, timeout=None, compiled=True):
+    """
+    Solve *files* on a pool of *workers* processes, writing each result to
+    *output* as a JSON line in the order they finish.  Returns the number of
+    boards solved.
+
+    At most *workers* boards are in flight at once.  If a worker dies (the
+    OOM killer, a segfault) the boards that were in flight are retried one at
+    a time on a fresh pool, so the board that killed it gets an error record
+    and the rest of the batch carries on.
+    """
+    workers = workers or os.cpu_count() or 1
+    solved = 0
+    queue = collections.deque(files)
+    suspects = collections.deque()  # in flight when a worker died
+
+    def write(record):
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+
+    while queue or suspects:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            running = {}  # future -> board file
+            broken = False
+            while not broken and (queue or suspects or running):
+                if suspects:
+                    if not running:  # alone, so a crash is its own
+                        file_name = suspects.popleft()
+                        running[pool.submit(solve_file, file_name, searcher_name, timeout, compiled)] = file_name
+                else:
+                    while queue and len(running) < workers:
+                        file_name = queue.popleft()
+                        running[pool.submit(solve_file, file_name, searcher_name, timeout, compiled)] = file_name
+                alone = len(running) == 1
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    file_name = running.pop(future)
+                    try:
+                        record = future.result()
+                    except concurrent.futures.BrokenExecutor as error:
+                        if not alone:
+                            suspects.append(file_name)
+                            broken = True
+                            continue
+                        record = {'board': file_name, 'status': 'error',
+                                  'error': '%s: %s' % (type(error).__name__, error)}
+                        broken = True
+                    solved += record['status'] == 'solved'
+                    write(record)
+            suspects.extend(running.values())  # lost with the pool
+    return solved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solve a batch of Bloxorz boards in parallel.')
+    parser.add_argument('boards', nargs='+', help='board files, directories or glob patterns')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('-t', '--timeout', type=float, default=None,
+                        help='seconds allowed per board')
+    parser.add_argument('-s', '--searcher', choices=sorted(SEARCHERS), default='bfs')
+    parser.add_argument('-o', '--output', default='-', help='JSONL output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    files = board_files(args.boards)
+    if not files:
+        parser.error('no board files match %s' % (args.boards,))
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        solve_all(files, output, args.searcher, args.workers, args.timeout)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#benchmark.py
+#CPOFFWEBSTER
+"""
+Benchmarks for the Bloxorz searchers.
+
+    python benchmark.py solvers [--sizes 10 20 40] [--seeds 3] [--report report.json]
+
+runs every searcher on the shipped boards/*.blx and on seeded random solvable
+boards (see board_generator), recording wall time, paths expanded, peak
+memory and solution length, and optionally writing them to a JSON report.
+
+    python benchmark.py frontier [--sizes 20 40 80] [--lengths 10000 100000]
+
+compares the deque-backed FIFO frontier with the original list frontier,
+which dequeued with list.pop(0), on BFSMultiPruneSearcher and on bare
+frontiers of growing length, which is where the O(n) pop(0) shows.
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import platform
+import signal
+import time
+import tracemalloc
+
+from bloxorz import Board
+from bloxorz_problem import BloxorzProblem, CompiledBloxorzProblem
+from board_generator import generate_board
+from graph_reduction import ReducedBloxorzProblem
+from batch_solve import SolveTimeout, raise_timeout
+from BFSMultiPruneSearcher import BFSMultiPruneSearcher
+from searchAStar import AStarSearcher, IDAStarSearcher
+from searchBFS import BFSSearcher
+from searchBiDir import BidirectionalSearcher
+from searchBoundedBFS import BoundedBFSSearcher
+from searchFrontier import FIFOFrontier
+try:
+    from searchLayeredBFS import LayeredBFSSearcher
+    from searchParallelBFS import ParallelBFSSearcher
+except ImportError:  # numpy is not installed
+    LayeredBFSSearcher = ParallelBFSSearcher = None
+
+
+class ListFrontier(object):
+    """The original frontier: a plain list dequeued with pop(0), O(n) per pop."""
+
+    def __init__(self):
+        self.paths = []
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path):
+        self.paths.append(path)
+
+    def pop(self):
+        return self.paths.pop(0)
+
+
+def open_board(size):
+    """Return a size x size board of solid tiles with start and goal in opposite corners."""
+    rows = [['X'] * size for _ in range(size)]
+    rows[0][0] = 'S'
+    rows[size - 1][size - 1] = 'G'
+    return Board(rows)
+
+
+def time_search(searcher_class, board, frontier_class):
+    """Solve *board* once; return (seconds, paths expanded, solution cost)."""
+    searcher = searcher_class(BloxorzProblem(board), frontier_class)
+    searcher.max_display_level = 0
+    begin = time.perf_counter()
+    path = searcher.search()
+    elapsed = time.perf_counter() - begin
+    return elapsed, searcher.num_expanded, path.cost if path is not None else None
+
+
+def compare(name, board):
+    list_time, expanded, cost = time_search(BFSMultiPruneSearcher, board, ListFrontier)
+    fifo_time, _, _ = time_search(BFSMultiPruneSearcher, board, FIFOFrontier)
+    print("%-22s %9d %6s %11.4f %11.4f %8.1fx" % (name, expanded, cost, list_time, fifo_time,
+                                                 list_time / fifo_time if fifo_time else float('nan')))
+
+
+def drain(frontier_class, length):
+    """Return the seconds taken to add and then pop *length* items."""
+    frontier = frontier_class()
+    begin = time.perf_counter()
+    for item in range(length):
+        frontier.add(item)
+    while frontier:
+        frontier.pop()
+    return time.perf_counter() - begin
+
+
+# name -> function making a searcher for a board
+SOLVERS = {
+    'bfs-tree': lambda board: BFSSearcher(BloxorzProblem(board)),
+    'bfs': lambda board: BFSMultiPruneSearcher(BloxorzProblem(board)),
+    'bfs-enqueue': lambda board: BFSMultiPruneSearcher(BloxorzProblem(board), prune_on_enqueue=True),
+    'bfs-compiled': lambda board: BFSMultiPruneSearcher(CompiledBloxorzProblem(board), prune_on_enqueue=True),
+    'bidirectional': lambda board: BidirectionalSearcher(BloxorzProblem(board)),
+    'astar': lambda board: AStarSearcher(BloxorzProblem(board)),
+    # tries every simple path before giving up on an unsolvable board
+    'idastar': lambda board: IDAStarSearcher(BloxorzProblem(board)),
+    'reduced': lambda board: AStarSearcher(ReducedBloxorzProblem(board)),
+    'bounded': lambda board: BoundedBFSSearcher(BloxorzProblem(board)),
+}
+if LayeredBFSSearcher is not None:
+    SOLVERS['layered'] = lambda board: LayeredBFSSearcher(CompiledBloxorzProblem(board))
+    SOLVERS['parallel'] = lambda board: ParallelBFSSearcher(CompiledBloxorzProblem(board))
+
+
+def run_solver(make_searcher, board, timeout=None, measure_memory=False):
+    """
+    Build a searcher for *board* and search once.  Returns a dict of status,
+    seconds (including building the problem), expanded, length and, with
+    *measure_memory*, peak_bytes traced by tracemalloc.
+    """
+    record = {}
+    if timeout is not None:
+        previous = signal.signal(signal.SIGALRM, raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    if measure_memory:
+        tracemalloc.start()
+    searcher = None
+    begin = time.perf_counter()
+    try:
+        searcher = make_searcher(board)
+        searcher.max_display_level = 0
+        path = searcher.search()
+        record['status'] = 'solved' if path is not None else 'unsolvable'
+        record['length'] = path.cost if path is not None else None
+    except SolveTimeout:
+        record['status'] = 'timeout'
+    finally:
+        record['seconds'] = time.perf_counter() - begin
+        if timeout is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        if measure_memory:
+            record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    record['expanded'] = searcher.num_expanded if searcher is not None else None
+    return record
+
+
+def benchmark_boards(args):
+    """Yield (name, board) for the shipped boards and the generated ones."""
+    for file_name in sorted(glob.glob('boards/*.blx')):
+        with open(file_name) as file:
+            yield file_name, Board.read_board(file)
+    for size in args.sizes:
+        for seed in range(args.seed, args.seed + args.seeds):
+            board = generate_board(size, size, args.void, args.weak, seed)
+            yield 'random %dx%d seed %d' % (size, size, seed), board
+
+
+def solvers_main(args):
+    names = args.solvers or list(SOLVERS)
+    results = []
+    print("%-26s %-14s %-10s %9s %6s %9s %11s" % ('board', 'solver', 'status', 'expanded',
+                                                  'length', 'seconds', 'peak KiB'))
+    for board_name, board in benchmark_boards(args):
+        for name in names:
+            record = run_solver(SOLVERS[name], board, args.timeout)
+            if args.memory and record['status'] != 'timeout':
+                record['peak_bytes'] = run_solver(SOLVERS[name], board, args.timeout, True)['peak_bytes']
+            record.update(board=board_name, solver=name, x_dim=board.x_dim, y_dim=board.y_dim)
+            results.append(record)
+            peak = record.get('peak_bytes')
+            print("%-26s %-14s %-10s %9s %6s %9.4f %11s" % (
+                board_name, name, record['status'], record['expanded'], record.get('length'),
+                record['seconds'], '-' if peak is None else peak // 1024))
+    if args.report:
+        report = {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'settings': {'sizes': args.sizes, 'seeds': args.seeds, 'seed': args.seed,
+                         'void': args.void, 'weak': args.weak, 'timeout': args.timeout},
+            'results': results,
+        }
+        with open(args.report, 'w') as file:
+            json.dump(report, file, indent=1)
+
+
+def frontier_main(args):
+    print("%-22s %9s %6s %11s %11s %9s" % ('board', 'expanded', 'cost', 'list pop(0)', 'deque', 'speedup'))
+    for file_name in sorted(glob.glob('boards/*.blx')):
+        with open(file_name) as file:
+            compare(file_name, Board.read_board(file))
+    for size in args.sizes:
+        compare('open %dx%d' % (size, size), open_board(size))
+
+    print()
+    print("%-22s %11s %11s %9s" % ('frontier length', 'list pop(0)', 'deque', 'speedup'))
+    for length in args.lengths:
+        list_time, fifo_time = drain(ListFrontier, length), drain(FIFOFrontier, length)
+        print("%-22d %11.4f %11.4f %8.1fx" % (length, list_time, fifo_time, list_time / fifo_time))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for the Bloxorz searchers.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solvers = commands.add_parser('solvers', help='time every searcher on shipped and generated boards')
+    solvers.add_argument('--sizes', type=int, nargs='*', default=[10, 20, 40],
+                         help='side lengths of the generated boards')
+    solvers.add_argument('--seeds', type=int, default=2, help='generated boards per size')
+    solvers.add_argument('--seed', type=int, default=0, help='first generator seed')
+    solvers.add_argument('--void', type=float, default=0.2, help='fraction of void tiles')
+    solvers.add_argument('--weak', type=float, default=0.1, help='fraction of the floor that is weak')
+    solvers.add_argument('--solvers', nargs='*', choices=sorted(SOLVERS),
+                         help='searchers to run (default: all)')
+    solvers.add_argument('--timeout', type=float, default=30.0, help='seconds allowed per run')
+    solvers.add_argument('--no-memory', dest='memory', action='store_false',
+                         help='skip the separate tracemalloc run for peak memory')
+    solvers.add_argument('--report', help='JSON file to write the results to')
+    solvers.set_defaults(run=solvers_main)
+
+    frontier = commands.add_parser('frontier', help='compare the deque and list.pop(0) frontiers')
+    frontier.add_argument('--sizes', type=int, nargs='*', default=[20, 40, 80, 120],
+                          help='side lengths of the synthetic open boards')
+    frontier.add_argument('--lengths', type=int, nargs='*', default=[10000, 100000, 300000],
+                          help='frontier lengths for the bare drain timing')
+    frontier.set_defaults(run=frontier_main)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
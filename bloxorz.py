@@ -1,7 +1,24 @@
 #Bloxorz
 
 import io
-from searchProblem import Path
+import mmap
+import re
+import struct
+from array import array
+from searchCore import Path
+
+# deletes every valid tile character, leaving only invalid ones
+_DELETE_TILES = str.maketrans('', '', 'SXGWO')
+_ADJACENT_NON_SPACE = re.compile(rb'\S\S')
+
+# Binary format tile codes, two bits each; S and G are stored as coordinates
+# and their tiles as solid.
+_BINARY_CODES = {'O': 0, 'X': 1, 'S': 1, 'G': 1, 'W': 2}
+_BINARY_TILES = 'OXW'
+_BINARY_DIMENSIONS = struct.Struct('<6I')  # x_dim, y_dim, start x, y, goal x, y
+# packed byte -> its four tiles, lowest bits first
+_UNPACK_TILES = tuple(''.join(_BINARY_TILES[(byte >> shift) & 3] if (byte >> shift) & 3 < 3 else '?'
+                              for shift in (0, 2, 4, 6)) for byte in range(256))
 
 
 class Board(object):
@@ -13,7 +30,8 @@ class Board(object):
     def __init__(self, rows):
         """
         Construction is done with a sequence of sequences; they must all be the
-        same length.
+        same length.  Each row is stored as a string with one character per
+        tile, so a row can also be given as a string such as 'SXXOG'.
         """
         valid_board_chars = ('S', 'X', 'G', 'W', 'O')
         y_dim = len(rows)
@@ -24,21 +42,27 @@ class Board(object):
         start_count = goal_count = 0
         for y, row in enumerate(rows):
             assert len(row) == x_dim, str((x_dim, len(row)))
-            for x, tile in enumerate(row):
-                if tile not in valid_board_chars:
-                    raise ValueError('expected tile in %s, got %s' % (valid_board_chars, tile))
-                if tile == 'G':
-                    goal_count += 1
-                    self.goal = x, y
-                elif tile == 'S':
-                    start_count += 1
-                    self.start = x, y
-            self.rows.append(tuple(row))
-        self.x_dim, self.y_dim = x + 1, y + 1
+            tiles = row if isinstance(row, str) else ''.join(row)
+            if len(tiles) != x_dim or tiles.translate(_DELETE_TILES):
+                for tile in row:
+                    if tile not in valid_board_chars:
+                        raise ValueError('expected tile in %s, got %s' % (valid_board_chars, tile))
+            count = tiles.count('G')
+            if count:
+                goal_count += count
+                self.goal = tiles.rindex('G'), y
+            count = tiles.count('S')
+            if count:
+                start_count += count
+                self.start = tiles.rindex('S'), y
+            self.rows.append(tiles)
+        self.x_dim, self.y_dim = x_dim, y_dim
         if goal_count != 1:
             raise ValueError('expected exactly one goal tile')
         if start_count != 1:
             raise ValueError('expected exactly one start tile')
+        self._state_space = None
+        self._distance_map = None
 
     def on_board(self, square):
         """
@@ -64,12 +88,113 @@ class Board(object):
 
         return True
 
+    def set_tile(self, square, tile):
+        """
+        Change the tile at *square* (x, y) to *tile*, one of 'X', 'O' or 'W'.
+        The start and goal tiles can't be changed.  Drops the cached
+        StateSpace and DistanceMap.
+        """
+        x, y = square
+        if tile not in ('X', 'O', 'W'):
+            raise ValueError("expected tile in %s, got %s" % (('X', 'O', 'W'), tile))
+        if not (0 <= x < self.x_dim and 0 <= y < self.y_dim):
+            raise ValueError("expected a square on the board, got %s" % (square,))
+        if square in (self.start, self.goal):
+            raise ValueError("can't change the start or goal tile at %s" % (square,))
+        row = self.rows[y]
+        self.rows[y] = row[:x] + tile + row[x + 1:]
+        self._state_space = None
+        self._distance_map = None
+
+    def state_space(self):
+        """
+        Return the compiled StateSpace for this board, building it on first use.
+        """
+        if self._state_space is None:
+            self._state_space = StateSpace(self)
+        return self._state_space
+
+    def distance_map(self):
+        """
+        Return the DistanceMap to this board's goal, building it on first use.
+        """
+        if self._distance_map is None:
+            self._distance_map = DistanceMap(self.state_space())
+        return self._distance_map
+
+    def start_distances(self):
+        """
+        Return a y_dim x x_dim grid (list of lists) of the shortest solution
+        length with the block starting upright on each square, None where it
+        can't stand there or can't reach the goal.  One search serves every
+        square.
+        """
+        return self.distance_map().upright_grid()
+
+    def solution_from(self, square):
+        """
+        Return a shortest action string with the block starting upright on
+        *square* (x, y), or None if there is none.
+        """
+        return self.distance_map().solution((square, square))
+
+    def unreachable_goal(self):
+        """
+        Cheap check for unsolvable boards, linear in the number of squares.
+        Return True if the goal provably can't be reached; False means the
+        check is inconclusive and only a search can tell.
+
+        Every roll keeps the block on squares 4-connected to the ones it left,
+        so the start and goal must share a component of non-void squares.
+        Within a component, x mod 3 of an upright block (and the square it
+        would stand up on when lying along x) is unchanged by every roll
+        except rolling a block lying along y sideways; likewise y mod 3.  Both
+        need a 2x2 patch of non-void squares, so a component without one can
+        only reach upright squares congruent to the start mod 3.
+        """
+        x_dim, y_dim, rows = self.x_dim, self.y_dim, self.rows
+        parent = array('i', range(x_dim * y_dim))
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]  # path halving
+                cell = parent[cell]
+            return cell
+
+        for y, row in enumerate(rows):
+            for x, tile in enumerate(row):
+                if tile == 'O':
+                    continue
+                cell = y * x_dim + x
+                if x + 1 < x_dim and row[x + 1] != 'O':
+                    parent[find(cell)] = find(cell + 1)
+                if y + 1 < y_dim and rows[y + 1][x] != 'O':
+                    parent[find(cell)] = find(cell + x_dim)
+        (sx, sy), (gx, gy) = self.start, self.goal
+        component = find(sy * x_dim + sx)
+        if component != find(gy * x_dim + gx):
+            return True
+        if (sx - gx) % 3 == 0 and (sy - gy) % 3 == 0:
+            return False
+        for y in range(y_dim - 1):
+            row, below = rows[y], rows[y + 1]
+            for x in range(x_dim - 1):
+                if ('O' not in (row[x], row[x + 1], below[x], below[x + 1])
+                        and find(y * x_dim + x) == component):
+                    return False  # sideways rolls possible, parity can change
+        return True
+
     HEADER_STRING = 'BLOX'
     CURRENT_VERSION = '1'
     SUPPORTED_VERSIONS = (CURRENT_VERSION,)
-
-    @staticmethod
-    def read_board(file):
+    # Binary format: the line 'BLOX 2', then x_dim, y_dim, start x, y and goal
+    # x, y as little-endian uint32s, then the tiles row by row, four to a byte
+    # (O=0, X=1, W=2, first tile in the lowest bits).
+    BINARY_VERSION = '2'
+    BINARY_HEADER = ('%s %s\n' % (HEADER_STRING, BINARY_VERSION)).encode('ascii')
+
+    @classmethod
+    def read_board(cls, file):
         """
         Read a board from a file.  The format is show below; whitespace is used to separate tokens.
         Note that the first line in the file must be a header line with a supported version number.
@@ -89,14 +214,123 @@ class Board(object):
             raise ValueError("expected positive board dimensions, but got %s" % ((x_dim, y_dim),))
 
         rows = list()
-        for row_idx, line in enumerate(file):
+        for line in file:
             tiles = line.split()
+            if not tiles:  # blank line
+                continue
             if len(tiles) != x_dim:
-                raise ValueError("expected row with %d tiles, but got %s in row %d" % (x_dim, tiles, row_idx))
+                raise ValueError("expected row with %d tiles, but got %s in row %d" % (x_dim, tiles, len(rows)))
             rows.append(tiles)
-        if row_idx != y_dim - 1:
-            raise ValueError("expected %d rows but got %d" % (y_dim, row_idx))
-        return Board(rows)
+        if len(rows) != y_dim:
+            raise ValueError("expected %d rows but got %d" % (y_dim, len(rows)))
+        return cls(rows)
+
+    @classmethod
+    def load_board(cls, file_name):
+        """
+        Read a board from the file named *file_name*, in the same format and
+        with the same checks as read_board, or in the binary format (see
+        read_binary_board).  A text file is memory-mapped and
+        each line is turned straight into a row string, without a string
+        object per tile, so large boards load in time and memory linear in
+        their size.
+        """
+        with open(file_name, 'rb') as file:
+            if file.read(len(Board.BINARY_HEADER)) == Board.BINARY_HEADER:
+                file.seek(0)
+                return cls.read_binary_board(file)
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                data = None
+            try:
+                return cls._parse_mapped(data)
+            finally:
+                if data is not None:
+                    data.close()
+
+    @classmethod
+    def _parse_mapped(cls, data):
+        """Parse the rows of a board file from mmap (or None for an empty file) *data*."""
+        readline = data.readline if data is not None else (lambda: b'')
+        header_info = readline().decode('ascii', 'replace').split()
+        if len(header_info) != 2 or header_info[0] != Board.HEADER_STRING or header_info[
+            1] not in Board.SUPPORTED_VERSIONS:
+            raise ValueError("expected valid board file header, but got %s" % (header_info,))
+
+        dimensions = readline().decode('ascii', 'replace').split()
+        if len(dimensions) != 2:
+            raise ValueError("expected 2 board dimensions, but got %s" % (dimensions,))
+        # This conversion will raise an error if either string cannot be converted to an int
+        x_dim, y_dim = int(dimensions[0]), int(dimensions[1])
+        if x_dim <= 0 or y_dim <= 0:
+            raise ValueError("expected positive board dimensions, but got %s" % ((x_dim, y_dim),))
+
+        rows = list()
+        line = readline()
+        while line:
+            tiles = line.translate(None, b' \t\r\n\v\f')
+            if tiles:  # skip blank lines
+                # one character per tile means no two non-space characters are adjacent
+                if len(tiles) != x_dim or _ADJACENT_NON_SPACE.search(line):
+                    raise ValueError("expected row with %d tiles, but got %s in row %d"
+                                     % (x_dim, line.decode('ascii', 'replace').split(), len(rows)))
+                rows.append(tiles.decode('ascii', 'replace'))
+            line = readline()
+        if len(rows) != y_dim:
+            raise ValueError("expected %d rows but got %d" % (y_dim, len(rows)))
+        return cls(rows)
+
+    @classmethod
+    def read_binary_board(cls, file):
+        """
+        Read a board in the binary format from binary *file*: the header line,
+        the dimensions, then the packed tiles in a single read.
+        """
+        header = file.readline()
+        if header != Board.BINARY_HEADER:
+            raise ValueError("expected binary board file header, but got %s" % (header,))
+        dimensions = file.read(_BINARY_DIMENSIONS.size)
+        if len(dimensions) != _BINARY_DIMENSIONS.size:
+            raise ValueError("expected board dimensions, but the file ended")
+        x_dim, y_dim, start_x, start_y, goal_x, goal_y = _BINARY_DIMENSIONS.unpack(dimensions)
+        if x_dim <= 0 or y_dim <= 0:
+            raise ValueError("expected positive board dimensions, but got %s" % ((x_dim, y_dim),))
+        size = (x_dim * y_dim + 3) // 4
+        data = file.read(size + 1)
+        if len(data) != size:
+            raise ValueError("expected %d bytes of tiles but got %d" % (size, len(data)))
+
+        tiles = ''.join(map(_UNPACK_TILES.__getitem__, data))
+        rows = [tiles[y * x_dim:(y + 1) * x_dim] for y in range(y_dim)]
+        for (x, y), tile in (((start_x, start_y), 'S'), ((goal_x, goal_y), 'G')):
+            if not (x < x_dim and y < y_dim) or rows[y][x] != 'X':
+                raise ValueError("expected %s on a solid tile, but got %s" % (tile, (x, y)))
+            rows[y] = rows[y][:x] + tile + rows[y][x + 1:]
+        return cls(rows)
+
+    def write_binary_board(self, file):
+        """
+        Write this board to binary *file* in the format read by read_binary_board.
+        """
+        codes = ''.join(self.rows).translate(str.maketrans(
+            {tile: chr(code) for tile, code in _BINARY_CODES.items()})).encode('latin-1')
+        codes += bytes(-len(codes) % 4)
+        packed = bytes(a | b << 2 | c << 4 | d << 6
+                       for a, b, c, d in zip(codes[0::4], codes[1::4], codes[2::4], codes[3::4]))
+        file.write(Board.BINARY_HEADER)
+        file.write(_BINARY_DIMENSIONS.pack(self.x_dim, self.y_dim, self.start[0], self.start[1],
+                                           self.goal[0], self.goal[1]))
+        file.write(packed)
+
+    def write_board(self, file):
+        """
+        Write this board to a file in the format read by read_board.
+        """
+        file.write('%s %s\n' % (Board.HEADER_STRING, Board.CURRENT_VERSION))
+        file.write('%d %d\n' % (self.x_dim, self.y_dim))
+        for row in self.rows:
+            file.write(' '.join(row) + '\n')
     # End class Board
 
 
@@ -104,6 +338,223 @@ ACTIONS = tuple(('U', 'D', 'L', 'R'))
 
 reverse_action_dict = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}
 
+# index of the reverse of ACTIONS[i]
+REVERSE_ACTION_INDEX = (1, 0, 3, 2)
+
+
+def canonical_position(pos):
+    """
+    Return *pos* with its two squares in sorted order, so a lying block has
+    exactly one representation.
+
+    >>> canonical_position(((2, 0), (1, 0)))
+    ((1, 0), (2, 0))
+    """
+    a_pos, b_pos = pos
+    if b_pos < a_pos:
+        return b_pos, a_pos
+    return a_pos, b_pos
+
+
+# orientation of a canonical position: upright, lying along x, lying along y
+UPRIGHT, ALONG_X, ALONG_Y = 0, 1, 2
+
+
+def orientation(pos):
+    """
+    Return the orientation of canonical position *pos*, or None if its
+    squares are neither equal nor adjacent in sorted order.
+    """
+    ((ax, ay), (bx, by)) = pos
+    if (ax, ay) == (bx, by):
+        return UPRIGHT
+    if by == ay and bx == ax + 1:
+        return ALONG_X
+    if bx == ax and by == ay + 1:
+        return ALONG_Y
+    return None
+
+
+def oriented_position(x, y, orientation):
+    """Return the canonical position with first square (x, y) and *orientation*."""
+    if orientation == UPRIGHT:
+        return (x, y), (x, y)
+    if orientation == ALONG_X:
+        return (x, y), (x + 1, y)
+    return (x, y), (x, y + 1)
+
+
+def grid_index(pos, x_dim, y_dim):
+    """
+    Return the index (y * x_dim + x) * 3 + orientation of canonical position
+    *pos* in a cells x 3 grid, or None if it doesn't lie on a board of that
+    size.
+
+    >>> grid_index(((1, 0), (2, 0)), 4, 2)
+    4
+    """
+    ((ax, ay), (bx, by)) = pos
+    if not (0 <= ax < x_dim and 0 <= ay < y_dim and 0 <= bx < x_dim and 0 <= by < y_dim):
+        return None
+    pos_orientation = orientation(pos)
+    if pos_orientation is None:
+        return None
+    return (ay * x_dim + ax) * 3 + pos_orientation
+
+
+def grid_position(idx, x_dim):
+    """
+    Return the canonical position at index *idx* of a cells x 3 grid (see grid_index).
+
+    >>> grid_position(4, 4)
+    ((1, 0), (2, 0))
+    """
+    cell, cell_orientation = divmod(idx, 3)
+    y, x = divmod(cell, x_dim)
+    return oriented_position(x, y, cell_orientation)
+
+
+class StateSpace(object):
+    """
+    The legal block positions of a board compiled to dense integer ids, with a
+    successor table built once.
+
+    *successors* is a flat int32 array of states x 4 entries; entry
+    ``sid * 4 + i`` is the id reached from state *sid* by ``ACTIONS[i]``, or -1
+    if that move is illegal.  Because every roll can be undone by the opposite
+    roll, predecessors come from the same table through REVERSE_ACTION_INDEX.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.positions = list()  # id -> canonical position
+        self.ids = dict()  # canonical position -> id
+        for y in range(board.y_dim):
+            for x in range(board.x_dim):
+                # upright, lying along x, lying along y
+                for pos in (((x, y), (x, y)), ((x, y), (x + 1, y)), ((x, y), (x, y + 1))):
+                    if board.legal_position(pos):
+                        self.ids[pos] = len(self.positions)
+                        self.positions.append(pos)
+        self.num_states = len(self.positions)
+
+        successors = array('i', [-1]) * (self.num_states * 4)
+        ids = self.ids
+        for sid, pos in enumerate(self.positions):
+            for i, action in enumerate(ACTIONS):
+                successors[sid * 4 + i] = ids.get(canonical_position(next_position(pos, action)), -1)
+        self.successors = successors
+
+    def __len__(self):
+        return self.num_states
+
+    def encode(self, pos):
+        """Return the id of position *pos*; raises KeyError if it is not legal."""
+        return self.ids[canonical_position(pos)]
+
+    def lookup(self, pos):
+        """Return the id of position *pos*, or None if it is not legal."""
+        return self.ids.get(canonical_position(pos))
+
+    def decode(self, sid):
+        """Return the ((x1, y1), (x2, y2)) position of state *sid*."""
+        return self.positions[sid]
+
+    def next_state(self, sid, action_idx, forward=True):
+        """
+        Return the state reached from *sid* by ACTIONS[action_idx], or -1.
+        With *forward* False, return the state that reaches *sid* by that action.
+        """
+        if not forward:
+            action_idx = REVERSE_ACTION_INDEX[action_idx]
+        return self.successors[sid * 4 + action_idx]
+
+
+class DistanceMap(object):
+    """
+    Exact number of rolls from every state of a StateSpace to the board's goal,
+    found with one breadth-first search backwards from the goal.
+
+    *distances* is an int32 array indexed by state id, -1 where the goal can't
+    be reached.  Once built, the shortest solution from any position is a
+    walk down the distance gradient.
+    """
+
+    def __init__(self, states):
+        self.states = states
+        goal = states.board.goal
+        self.goal = states.encode((goal, goal))
+        distances = array('i', [-1]) * states.num_states
+        successors = states.successors
+        distances[self.goal] = 0
+        layer = [self.goal]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for sid in layer:
+                for i in range(4):
+                    # sid is reached by ACTIONS[i] from the state its reverse roll leads to
+                    pred = successors[sid * 4 + REVERSE_ACTION_INDEX[i]]
+                    if pred >= 0 and distances[pred] < 0:
+                        distances[pred] = depth
+                        next_layer.append(pred)
+            layer = next_layer
+        self.distances = distances
+
+    def distance(self, pos):
+        """
+        Return the number of rolls from position *pos* to the goal, or None if
+        *pos* is not legal or can't reach the goal.
+        """
+        sid = self.states.lookup(pos)
+        if sid is None or self.distances[sid] < 0:
+            return None
+        return self.distances[sid]
+
+    def state_path(self, sid):
+        """
+        Return (actions, state ids) of a shortest solution from state *sid*,
+        or None if the goal can't be reached.
+        """
+        distances, successors = self.distances, self.states.successors
+        if distances[sid] < 0:
+            return None
+        actions, sids = [], [sid]
+        while distances[sid] > 0:
+            for i in range(4):
+                nxt = successors[sid * 4 + i]
+                if nxt >= 0 and distances[nxt] == distances[sid] - 1:
+                    actions.append(ACTIONS[i])
+                    sids.append(nxt)
+                    sid = nxt
+                    break
+        return ''.join(actions), sids
+
+    def solution(self, pos):
+        """
+        Return a shortest action string (e.g. 'RRDL') from position *pos* to
+        the goal, or None if there is none.
+        """
+        sid = self.states.lookup(pos)
+        if sid is None:
+            return None
+        found = self.state_path(sid)
+        return found[0] if found is not None else None
+
+    def upright_grid(self):
+        """
+        Return a y_dim x x_dim grid (list of lists) of the distance with the
+        block upright on each square, None where that isn't a reachable state.
+        """
+        board = self.states.board
+        grid = [[None] * board.x_dim for _ in range(board.y_dim)]
+        distances = self.distances
+        for sid, ((x, y), b_pos) in enumerate(self.states.positions):
+            if (x, y) == b_pos and distances[sid] >= 0:
+                grid[y][x] = distances[sid]
+        return grid
+
 
 def next_position(pos, action, forward=True):
     """
@@ -162,16 +613,16 @@ def next_position(pos, action, forward=True):
 
     act = action  # if the action is backwards than switch the action
     if forward is False:
-        if act is 'U':
+        if act == 'U':
             act = 'D'
-        elif act is 'D':
+        elif act == 'D':
             act = 'U'
-        elif act is 'R':
+        elif act == 'R':
             act = 'L'
-        elif act is 'L':
+        elif act == 'L':
             act = 'R'
 
-    if act is 'U':  # up
+    if act == 'U':  # up
         x1, y1 = pos[0]
         x2, y2 = pos[1]
 
@@ -200,7 +651,7 @@ def next_position(pos, action, forward=True):
             return newPosition
 
 
-    if act is 'D':  # down
+    if act == 'D':  # down
         x1, y1 = pos[0]
         x2, y2 = pos[1]
 
@@ -229,7 +680,7 @@ def next_position(pos, action, forward=True):
             return newPosition
 
 
-    if act is 'L':  # left
+    if act == 'L':  # left
         x1, y1 = pos[0]
         x2, y2 = pos[1]
 
@@ -258,7 +709,7 @@ def next_position(pos, action, forward=True):
             return newPosition
 
 
-    if act is 'R':  # right
+    if act == 'R':  # right
         x1, y1 = pos[0]
         x2, y2 = pos[1]
 
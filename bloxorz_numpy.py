@@ -0,0 +1,180 @@
+#bloxorz_numpy.py
+#CPOFFWEBSTER
+"""
+NumPy backend for Bloxorz boards.  NumpyBoard keeps the grid as a padded
+uint8 array with boolean tile masks, and compiles its StateSpace with whole
+array operations instead of one legality check per position.  Requires numpy.
+"""
+
+from array import array
+
+import numpy as np
+
+from bloxorz import ALONG_X, ALONG_Y, UPRIGHT, Board, StateSpace, canonical_position, oriented_position, orientation
+
+TILE_CODES = {'O': 0, 'X': 1, 'S': 2, 'G': 3, 'W': 4}
+VOID, WEAK = TILE_CODES['O'], TILE_CODES['W']
+
+# Every roll moves a square at most two cells, so a two-cell border of void
+# means neighbours of legal positions never need a bounds check.
+PAD = 2
+
+# MOVES[orientation][action index] = (dx, dy, new orientation), relative to
+# the position's first (top-left) square
+MOVES = (
+    ((0, -2, ALONG_Y), (0, 1, ALONG_Y), (-2, 0, ALONG_X), (1, 0, ALONG_X)),
+    ((0, -1, ALONG_X), (0, 1, ALONG_X), (-1, 0, UPRIGHT), (2, 0, UPRIGHT)),
+    ((0, -1, UPRIGHT), (0, 2, UPRIGHT), (-1, 0, ALONG_Y), (1, 0, ALONG_Y)),
+)
+
+
+class NumpyBoard(Board):
+    """
+    Board whose tiles are held in *grid*, a uint8 array of TILE_CODES padded
+    with PAD void cells on every side, with boolean masks *void*, *weak* and
+    *solid* (floor that can carry the upright block) of the same shape.
+    """
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        codes = np.array([[TILE_CODES[tile] for tile in row] for row in self.rows], dtype=np.uint8)
+        self.grid = np.zeros((self.y_dim + 2 * PAD, self.x_dim + 2 * PAD), dtype=np.uint8)
+        self.grid[PAD:PAD + self.y_dim, PAD:PAD + self.x_dim] = codes
+        self.void = self.grid == VOID
+        self.weak = self.grid == WEAK
+        self.solid = ~(self.void | self.weak)
+
+    def set_tile(self, square, tile):
+        """
+        Board.set_tile, also updating *grid* and the tile masks for that square.
+        """
+        super().set_tile(square, tile)
+        x, y = square
+        code = TILE_CODES[tile]
+        cell = (y + PAD, x + PAD)
+        self.grid[cell] = code
+        self.void[cell] = code == VOID
+        self.weak[cell] = code == WEAK
+        self.solid[cell] = code != VOID and code != WEAK
+
+    def on_board(self, square):
+        """
+        Determine if *square* (x, y) is on the board, which means also not on a
+        void position.
+        """
+        x, y = square
+        if -PAD <= x < self.x_dim + PAD and -PAD <= y < self.y_dim + PAD:
+            return not self.void[y + PAD, x + PAD]
+        return False
+
+    def legal_masks(self):
+        """
+        Return a bool array of shape (3, y_dim + 2 * PAD, x_dim + 2 * PAD)
+        that is True where a block with its first square on that (padded) cell
+        is legal, for each orientation UPRIGHT, ALONG_X and ALONG_Y.
+        """
+        floor = ~self.void
+        masks = np.zeros((3,) + self.grid.shape, dtype=bool)
+        masks[UPRIGHT] = self.solid
+        masks[ALONG_X, :, :-1] = floor[:, :-1] & floor[:, 1:]
+        masks[ALONG_Y, :-1, :] = floor[:-1, :] & floor[1:, :]
+        return masks
+
+    def legal_positions(self, positions):
+        """
+        Determine for each ((x1, y1), (x2, y2)) row of int array *positions*
+        (shape n x 2 x 2) whether it is a legal position.  Squares must be
+        adjacent or equal, as produced by next_position.
+        """
+        positions = np.asarray(positions)
+        ax, ay = positions[:, 0, 0] + PAD, positions[:, 0, 1] + PAD
+        bx, by = positions[:, 1, 0] + PAD, positions[:, 1, 1] + PAD
+        height, width = self.grid.shape
+        inside = ((ax >= 0) & (ay >= 0) & (ax < width) & (ay < height) &
+                  (bx >= 0) & (by >= 0) & (bx < width) & (by < height))
+        legal = np.zeros(len(positions), dtype=bool)
+        ax, ay, bx, by = ax[inside], ay[inside], bx[inside], by[inside]
+        upright = (ax == bx) & (ay == by)
+        legal[inside] = (~self.void[ay, ax] & ~self.void[by, bx] &
+                         ~(upright & self.weak[ay, ax]))
+        return legal
+
+    def state_space(self):
+        """
+        Return the compiled NumpyStateSpace for this board, building it on first use.
+        """
+        if self._state_space is None:
+            self._state_space = NumpyStateSpace(self)
+        return self._state_space
+
+
+class NumpyStateSpace(StateSpace):
+    """
+    StateSpace built from a NumpyBoard with array operations.  State ids are
+    numbered in the same order as StateSpace (row by row, then UPRIGHT,
+    ALONG_X, ALONG_Y), so the two are interchangeable.
+
+    *table* is the states x 4 int32 successor matrix; *successors* is the same
+    data as a flat array('i') for fast scalar indexing.  *xs*, *ys* and
+    *orientations* give each state's first square and orientation.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        masks = board.legal_masks()
+        # ids laid out (y, x, orientation) to number states row by row
+        legal = masks.transpose(1, 2, 0)
+        id_grid = np.full(legal.shape, -1, dtype=np.int32)
+        self.num_states = int(legal.sum())
+        id_grid[legal] = np.arange(self.num_states, dtype=np.int32)
+        self.id_grid = id_grid
+
+        ys, xs, orientations = np.nonzero(legal)
+        table = np.empty((self.num_states, 4), dtype=np.int32)
+        for orientation in (UPRIGHT, ALONG_X, ALONG_Y):
+            rows = np.nonzero(orientations == orientation)[0]
+            for i, (dx, dy, new_orientation) in enumerate(MOVES[orientation]):
+                table[rows, i] = id_grid[ys[rows] + dy, xs[rows] + dx, new_orientation]
+        self.table = table
+        self.successors = array('i', table.tobytes())
+        self.xs, self.ys, self.orientations = xs - PAD, ys - PAD, orientations
+        self._positions = None
+        self._ids = None
+
+    @property
+    def positions(self):
+        """id -> canonical position, built on first use."""
+        if self._positions is None:
+            self._positions = [self.decode(sid) for sid in range(self.num_states)]
+        return self._positions
+
+    @property
+    def ids(self):
+        """canonical position -> id, built on first use."""
+        if self._ids is None:
+            self._ids = {pos: sid for sid, pos in enumerate(self.positions)}
+        return self._ids
+
+    def lookup(self, pos):
+        """Return the id of position *pos*, or None if it is not legal."""
+        pos = canonical_position(pos)
+        pos_orientation = orientation(pos)
+        if pos_orientation is None:
+            return None
+        ((ax, ay), _) = pos
+        height, width = self.id_grid.shape[:2]
+        if not (0 <= ax + PAD < width and 0 <= ay + PAD < height):
+            return None
+        sid = int(self.id_grid[ay + PAD, ax + PAD, pos_orientation])
+        return sid if sid >= 0 else None
+
+    def encode(self, pos):
+        """Return the id of position *pos*; raises KeyError if it is not legal."""
+        sid = self.lookup(pos)
+        if sid is None:
+            raise KeyError(pos)
+        return sid
+
+    def decode(self, sid):
+        """Return the ((x1, y1), (x2, y2)) position of state *sid*."""
+        return oriented_position(int(self.xs[sid]), int(self.ys[sid]), self.orientations[sid])
@@ -1,10 +1,11 @@
-from searchProblem import Arc, Search_problem
-import searchBFS
-import searchBiDir
-import BFSMultiPruneSearcher
-import io
-from bloxorz import Board
+from searchCore import Arc, Search_problem
 from bloxorz import next_position
+from bloxorz import ACTIONS
+
+
+def path_actions(path):
+    """Return the action string (e.g. 'RRDL') along *path*, from its start."""
+    return ''.join(arc.action for arc in path.arcs())
 
 
 class BloxorzProblem(Search_problem):
@@ -12,10 +13,13 @@ class BloxorzProblem(Search_problem):
     def __init__(self, board, heur=0):
         """
         Build a problem instance from a board
+        With *heur* 'exact' the heuristic is the board's DistanceMap, the true
+        number of rolls to the goal; otherwise it is the geometric lower bound.
         """
         self.board = board
         self.start = (board.start, board.start)
         self.goal = (board.goal, board.goal)
+        self.heur = heur
 
     def start_node(self):
         """Returns start node"""
@@ -40,33 +44,98 @@ class BloxorzProblem(Search_problem):
 
         append list of arcs that are possible, use already built code in bloxorz.py
         as well as look at what is "possible"
+        With *forward* False the arcs lead to the nodes that reach *node*
+        by the arc's action.
         """
         arcs = []
 
-        ACTIONS = tuple(('U', 'D', 'L', 'R'))
         for x in range(0, 4):
-            new_node = next_position(node, action=ACTIONS[x], forward=True)
+            new_node = next_position(node, action=ACTIONS[x], forward=forward)
             if self.board.legal_position(new_node):
-                new_arc = Arc(node, new_node)
+                new_arc = Arc(node, new_node, action=ACTIONS[x])
                 arcs.append(new_arc)
 
         return arcs
 
 
+    def unreachable_goal(self):
+        """Returns True if the board's cheap precheck proves there is no solution,
+        so a search can be skipped.  False means search to find out."""
+        return self.board.unreachable_goal()
+
+    def distance_map(self):
+        """Returns the board's DistanceMap (built once per board)."""
+        return self.board.distance_map()
+
+    def distance(self, node):
+        """Returns the exact number of rolls from node to the goal, or None."""
+        return self.distance_map().distance(node)
+
     def heuristic(self, node):
         """Gives the heuristic value of node n.
-        Returns 0 if not overridden."""
-        pos1, pos2 = node
-        ((cx, cy), (cx2, cy2)) = pos1, pos2
-        pos = self.goal
-        (gx, gy) = pos[0]
-        dx = abs(cx - gx)
-        dy = abs(cy - gy)
-        dx2 = abs(cx2 - gy)
-        dy2 = abs(cy2 - gy)
-        if dx + dy > dx2 + dy2:
-            dist = dx + dy
-        else:
-            dist = dx2 + dy2
-        heuristic = dist*(1.0 + 1/1000)
-        return heuristic
+        With heur 'exact' this is the true distance (infinite where the goal
+        can't be reached).  Otherwise it is a lower bound on the number of rolls to the goal: a roll moves the
+        block's centre along one axis only, by at most 1.5 squares, so each
+        axis needs at least ceil(distance / 1.5) rolls.  It changes by at most
+        one per roll, so it is consistent as well as admissible.
+        """
+        if self.heur == 'exact':
+            distance = self.distance(node)
+            return distance if distance is not None else float('inf')
+        ((cx, cy), (cx2, cy2)) = node
+        (gx, gy) = self.board.goal
+        # centre coordinates are doubled to stay in integers: a roll moves them by at most 3
+        dx = abs(cx + cx2 - 2 * gx)
+        dy = abs(cy + cy2 - 2 * gy)
+        return (dx + 2) // 3 + (dy + 2) // 3
+
+
+class CompiledBloxorzProblem(BloxorzProblem):
+    """
+    BloxorzProblem whose nodes are the integer state ids of the board's
+    StateSpace.  Neighbors come straight out of the precomputed successor
+    table, so no positions are built or re-validated during search.
+    """
+
+    def __init__(self, board, heur=0):
+        """
+        Build a problem instance from a board
+        """
+        super().__init__(board, heur)
+        self.states = board.state_space()
+        self.start = self.states.encode(self.start)
+        self.goal = self.states.encode(self.goal)
+
+    def neighbors(self, node, forward=True):
+        """
+        Given a state id, return the Arcs to the states one roll away.
+        With *forward* False the arcs lead to the states that reach *node* by
+        the arc's action.
+        """
+        arcs = []
+        next_state = self.states.next_state
+        for x in range(0, 4):
+            new_node = next_state(node, x, forward)
+            if new_node >= 0:
+                arcs.append(Arc(node, new_node, action=ACTIONS[x]))
+        return arcs
+
+    def distance(self, node):
+        """Returns the exact number of rolls from state id node to the goal, or None."""
+        distance = self.distance_map().distances[node]
+        return distance if distance >= 0 else None
+
+    def heuristic(self, node):
+        """Gives the heuristic value of state id node."""
+        if self.heur == 'exact':
+            distance = self.distance_map().distances[node]
+            return distance if distance >= 0 else float('inf')
+        return super().heuristic(self.states.decode(node))
+
+    def decode(self, node):
+        """Return the ((x1, y1), (x2, y2)) position of state id *node*."""
+        return self.states.decode(node)
+
+    def decode_path(self, path):
+        """Return the positions along *path*, from start to end."""
+        return [self.states.decode(node) for node in reversed(list(path.nodes()))]
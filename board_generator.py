@@ -0,0 +1,91 @@
+#board_generator.py
+#CPOFFWEBSTER
+"""
+Seeded generator of random solvable Bloxorz boards:
+
+    python board_generator.py 40 30 --void 0.3 --weak 0.1 --seed 7 -o generated/40x30.blx
+"""
+
+import argparse
+import random
+import sys
+
+from bloxorz import Board
+
+
+def generate_board(x_dim, y_dim, void_density=0.2, weak_density=0.1, seed=None, attempts=100):
+    """
+    Return a random solvable Board of *x_dim* x *y_dim* tiles.  Each tile is
+    void with probability *void_density*, otherwise weak with probability
+    *weak_density*, otherwise solid.  The goal is placed on the solid tile
+    farthest (in rolls) from a random solid start tile.  The same *seed*
+    always gives the same board.
+    """
+    rng = random.Random(seed)
+    for _ in range(attempts):
+        rows = [['O' if rng.random() < void_density else
+                 'W' if rng.random() < weak_density else 'X'
+                 for _ in range(x_dim)] for _ in range(y_dim)]
+        solid = [(x, y) for y in range(y_dim) for x in range(x_dim) if rows[y][x] == 'X']
+        if len(solid) < 2:
+            continue
+        start, placeholder = rng.sample(solid, 2)
+        rows[start[1]][start[0]] = 'S'
+        rows[placeholder[1]][placeholder[0]] = 'G'  # Board needs a goal to compile
+        goal = farthest_upright(Board(rows))
+        if goal is None:
+            continue
+        rows[placeholder[1]][placeholder[0]] = 'X'
+        rows[goal[1]][goal[0]] = 'G'
+        return Board(rows)
+    raise ValueError("no solvable board found in %d attempts" % attempts)
+
+
+def farthest_upright(board):
+    """
+    Return the solid (x, y) tile, other than the start, where the upright
+    block is the most rolls away from the start, or None if there is none.
+    """
+    states = board.state_space()
+    successors = states.successors
+    start = states.encode((board.start, board.start))
+    seen = {start}
+    layer = [start]
+    farthest = None
+    while layer:
+        next_layer = []
+        for sid in layer:
+            for i in range(4):
+                nxt = successors[sid * 4 + i]
+                if nxt >= 0 and nxt not in seen:
+                    seen.add(nxt)
+                    next_layer.append(nxt)
+        for sid in next_layer:
+            a_pos, b_pos = states.decode(sid)
+            if a_pos == b_pos:
+                farthest = a_pos
+                break
+        layer = next_layer
+    return farthest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a random solvable Bloxorz board.')
+    parser.add_argument('x_dim', type=int)
+    parser.add_argument('y_dim', type=int)
+    parser.add_argument('--void', type=float, default=0.2, help='fraction of void tiles')
+    parser.add_argument('--weak', type=float, default=0.1, help='fraction of the floor that is weak')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-o', '--output', default='-', help='.blx file to write (default: stdout)')
+    args = parser.parse_args(argv)
+
+    board = generate_board(args.x_dim, args.y_dim, args.void, args.weak, args.seed)
+    if args.output == '-':
+        board.write_board(sys.stdout)
+    else:
+        with open(args.output, 'w') as file:
+            board.write_board(file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#convert_boards.py
+#CPOFFWEBSTER
+"""
+Convert text .blx boards to the binary BLOX 2 format, next to the originals:
+
+    python convert_boards.py boards/*.blx        # writes boards/*.blx2
+"""
+
+import argparse
+import os
+
+from bloxorz import Board
+
+
+def convert(file_name, output_name=None):
+    """Convert board *file_name* to binary *output_name* (default: the name with .blx2)."""
+    if output_name is None:
+        output_name = os.path.splitext(file_name)[0] + '.blx2'
+    board = Board.load_board(file_name)
+    with open(output_name, 'wb') as file:
+        board.write_binary_board(file)
+    return output_name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert .blx boards to the binary BLOX 2 format.')
+    parser.add_argument('boards', nargs='+', help='.blx files to convert')
+    args = parser.parse_args(argv)
+    for file_name in args.boards:
+        print(file_name, '->', convert(file_name))
+
+
+if __name__ == '__main__':
+    main()
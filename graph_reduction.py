@@ -0,0 +1,120 @@
+#graph_reduction.py
+#CPOFFWEBSTER
+"""
+Smaller search graphs for Bloxorz boards.
+
+StateSpace already gives each block position one canonical form, with its
+squares in sorted order.  ReducedGraph goes further: it drops dead-end
+branches that can't lie on a path between the start and goal, and replaces
+every chain of forced moves (states with exactly two neighbours) with a single
+macro arc carrying its cost and action string.  ReducedBloxorzProblem searches
+that graph; arcs have costs other than one, so use a cost-ordered searcher
+such as searchAStar.AStarSearcher.  path_actions() on the result gives the full
+action sequence.
+"""
+
+from bloxorz import ACTIONS, canonical_position, next_position
+from bloxorz_problem import CompiledBloxorzProblem, path_actions
+from searchCore import Arc
+
+
+class ReducedGraph(object):
+    """
+    The states of *states* (a StateSpace) that are junctions, dead ends or in
+    *keep*, joined by macro arcs.  *arcs* maps each kept state id to a list of
+    (state id, cost, action string), keeping the cheapest arc between any two
+    states.
+    """
+
+    def __init__(self, states, keep=()):
+        self.states = states
+        successors = states.successors
+        keep = set(keep)
+        degree = [sum(successors[sid * 4 + i] >= 0 for i in range(4)) for sid in range(states.num_states)]
+
+        # Dominance: a dead end that isn't kept can't be on any path between
+        # kept states, so peel dead ends off until none are left.
+        removed = bytearray(states.num_states)
+        stack = [sid for sid in range(states.num_states) if degree[sid] <= 1 and sid not in keep]
+        while stack:
+            sid = stack.pop()
+            if removed[sid]:
+                continue
+            removed[sid] = 1
+            for i in range(4):
+                nxt = successors[sid * 4 + i]
+                if nxt >= 0 and not removed[nxt]:
+                    degree[nxt] -= 1
+                    if degree[nxt] <= 1 and nxt not in keep:
+                        stack.append(nxt)
+        self.removed = removed
+
+        def live_moves(sid):
+            for i in range(4):
+                nxt = successors[sid * 4 + i]
+                if nxt >= 0 and not removed[nxt]:
+                    yield i, nxt
+
+        # Every state with other than two live neighbours is a node; chains of
+        # two-neighbour states between nodes become macro arcs.
+        nodes = [sid for sid in range(states.num_states)
+                 if not removed[sid] and (degree[sid] != 2 or sid in keep)]
+        node_set = set(nodes)
+        arcs = {sid: {} for sid in nodes}
+        for start in nodes:
+            for i, sid in live_moves(start):
+                actions = [ACTIONS[i]]
+                prev = start
+                while sid not in node_set:
+                    # a two-neighbour state has exactly one way on
+                    j, nxt = [(j, nxt) for j, nxt in live_moves(sid) if nxt != prev][0]
+                    actions.append(ACTIONS[j])
+                    prev, sid = sid, nxt
+                if sid == start:
+                    continue  # a loop back to where it started is never shorter
+                cost = len(actions)
+                best = arcs[start].get(sid)
+                if best is None or cost < best[0]:
+                    arcs[start][sid] = (cost, ''.join(actions))
+        self.arcs = {sid: [(to, cost, actions) for to, (cost, actions) in targets.items()]
+                     for sid, targets in arcs.items()}
+
+    def __len__(self):
+        return len(self.arcs)
+
+    def num_arcs(self):
+        return sum(len(targets) for targets in self.arcs.values())
+
+
+class ReducedBloxorzProblem(CompiledBloxorzProblem):
+    """
+    CompiledBloxorzProblem over the board's ReducedGraph.  Nodes are state
+    ids, and each arc's action is the string of rolls it stands for.
+    """
+
+    def __init__(self, board, heur=0):
+        """
+        Build a problem instance from a board
+        """
+        super().__init__(board, heur)
+        self.graph = ReducedGraph(self.states, keep=(self.start, self.goal))
+
+    def neighbors(self, node, forward=True):
+        """
+        Given a state id, return the macro Arcs leaving it.
+        There are no predecessor arcs: the macro arcs' costs differ, so
+        searchBiDir.BidirectionalSearcher, which meets breadth-first by
+        layers, would not find shortest paths over them.
+        """
+        if not forward:
+            raise ValueError("ReducedBloxorzProblem has no predecessor arcs; use a cost-ordered searcher")
+        return [Arc(node, to, cost, actions) for (to, cost, actions) in self.graph.arcs[node]]
+
+    def decode_path(self, path):
+        """Return every position along *path*, from start to end, with the macro arcs expanded."""
+        pos = self.states.decode(self.start)
+        positions = [pos]
+        for action in path_actions(path):
+            pos = canonical_position(next_position(pos, action))
+            positions.append(pos)
+        return positions
@@ -0,0 +1,145 @@
+#incremental_solver.py
+#CPOFFWEBSTER
+"""
+Distance-to-goal map that is repaired, rather than rebuilt, after tile edits.
+
+After set_tiles() only the block positions touching the edited squares are
+re-checked.  Distances that lost their support are raised and the rest
+lowered by a search limited to the affected positions, in the spirit of
+LPA*, so the work done grows with the size of the change rather than with the
+board.
+"""
+
+import heapq
+
+from bloxorz import ACTIONS, canonical_position, next_position
+
+
+def touching_positions(square):
+    """Return the five canonical positions that cover *square* (x, y)."""
+    x, y = square
+    return (((x, y), (x, y)),
+            ((x - 1, y), (x, y)), ((x, y), (x + 1, y)),
+            ((x, y - 1), (x, y)), ((x, y), (x, y + 1)))
+
+
+class IncrementalSolver(object):
+    """
+    Exact number of rolls to the goal for every position of *board* that can
+    reach it, kept up to date as tiles are edited through set_tiles().
+    *num_updated* is the number of positions whose distance the last edit
+    re-examined.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        distance_map = board.distance_map()
+        positions = distance_map.states.positions
+        self.distances = {positions[sid]: distance
+                          for sid, distance in enumerate(distance_map.distances) if distance >= 0}
+        self.num_updated = len(self.distances)
+
+    def neighbors(self, pos):
+        """Return the legal positions one roll from canonical position *pos*."""
+        legal_position = self.board.legal_position
+        result = []
+        for action in ACTIONS:
+            nxt = canonical_position(next_position(pos, action))
+            if legal_position(nxt):
+                result.append(nxt)
+        return result
+
+    def distance(self, pos):
+        """Return the number of rolls from *pos* to the goal, or None."""
+        return self.distances.get(canonical_position(pos))
+
+    def solution(self, pos):
+        """Return a shortest action string from *pos* to the goal, or None."""
+        pos = canonical_position(pos)
+        distance = self.distances.get(pos)
+        if distance is None:
+            return None
+        legal_position, distances = self.board.legal_position, self.distances
+        actions = []
+        while distance > 0:
+            for action in ACTIONS:
+                nxt = canonical_position(next_position(pos, action))
+                if distances.get(nxt) == distance - 1 and legal_position(nxt):
+                    actions.append(action)
+                    pos, distance = nxt, distance - 1
+                    break
+            else:  # no neighbor one roll closer: the distances are out of date
+                return None
+        return ''.join(actions)
+
+    def set_tile(self, square, tile):
+        """Change one tile (see Board.set_tile) and repair the distances."""
+        self.set_tiles({square: tile})
+
+    def set_tiles(self, edits):
+        """
+        Apply *edits*, a mapping of (x, y) squares to tiles, then repair the
+        distances.  If an edit is rejected, the edits before it stay applied
+        and the distances are repaired for them before the error propagates.
+        """
+        applied = []
+        try:
+            for square, tile in edits.items():
+                self.board.set_tile(square, tile)
+                applied.append(square)
+        finally:
+            touched = set()
+            for square in applied:
+                touched.update(touching_positions(square))
+            self.repair(touched)
+
+    def repair(self, touched):
+        """Bring the distances up to date after the legality of the *touched* positions changed."""
+        distances = self.distances
+        legal_position = self.board.legal_position
+        neighbors = self.neighbors
+
+        # Raise: positions that became illegal lose their distance, and so
+        # does every position left with no neighbor one roll closer to the goal.
+        invalid = set()
+        heap = []
+        for pos in touched:
+            if pos in distances and not legal_position(pos):
+                invalid.add(pos)
+                heapq.heappush(heap, (distances[pos], pos))
+        while heap:
+            distance, pos = heapq.heappop(heap)
+            if pos not in invalid:
+                # a candidate: keep it if some closer neighbor still holds
+                if any(distances.get(nxt) == distance - 1 and nxt not in invalid
+                       for nxt in neighbors(pos)):
+                    continue
+                invalid.add(pos)
+            # only legal positions have neighbors, but a removed one's old
+            # neighbors are still the positions one roll away from it
+            for action in ACTIONS:
+                nxt = canonical_position(next_position(pos, action))
+                if distances.get(nxt) == distance + 1 and nxt not in invalid:
+                    heapq.heappush(heap, (distance + 1, nxt))
+        for pos in invalid:
+            del distances[pos]
+
+        # Lower: seed every position that may now reach the goal more cheaply
+        # from its neighbors, then relax outwards.
+        heap = []
+        for pos in invalid | {pos for pos in touched if pos not in distances}:
+            if legal_position(pos):
+                best = min((distances[nxt] for nxt in neighbors(pos) if nxt in distances), default=None)
+                if best is not None:
+                    heapq.heappush(heap, (best + 1, pos))
+        updated = len(invalid)
+        while heap:
+            distance, pos = heapq.heappop(heap)
+            if distances.get(pos, distance + 1) <= distance:
+                continue
+            distances[pos] = distance
+            updated += 1
+            for nxt in neighbors(pos):
+                if distances.get(nxt, distance + 2) > distance + 1:
+                    heapq.heappush(heap, (distance + 1, nxt))
+        self.num_updated = updated
@@ -0,0 +1,170 @@
+#searchAStar.py
+#CPOFFWEBSTER
+
+
+
+from searchCore import Displayable, Path, visualize
+from searchFrontier import PriorityFrontier
+
+
+class AStarSearcher(Displayable):
+    """returns a searcher for a problem.
+    Paths can be found by repeatedly calling search().
+    This does A* search: the frontier is a binary heap ordered by
+    cost + problem.heuristic, and a closed set prunes nodes already expanded.
+    Paths are optimal when the heuristic is consistent.
+    """
+
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem):
+        """creates a searcher from a problem
+        """
+        self.problem = problem
+        self.initialize_frontier()
+        self.num_expanded = 0
+        self.add_to_frontier(Path(problem.start_node()))
+        super().__init__()
+        self.max_display_level
+        self.closed = set()  # pruning
+
+    def initialize_frontier(self):
+        heuristic = self.problem.heuristic
+        self.frontier = PriorityFrontier(lambda path: path.cost + heuristic(path.end()))
+
+    def empty_frontier(self):
+        return not self.frontier
+
+    def add_to_frontier(self, path):
+        self.frontier.add(path)
+
+    @visualize
+    def search(self):
+        """returns (next) path from the problem's start node
+        to a goal node.
+        Returns None if no path exists.
+        """
+        stats = self.stats
+        while not self.empty_frontier():
+            if stats is not None:
+                stats.frontier_size(len(self.frontier))
+            path = self.frontier.pop()
+            if path.end() not in self.closed:  # don't check repeats
+                self.display(2, "Expanding:", path, "(cost:", path.cost, ")")
+                self.closed.add(path.end())
+                self.num_expanded += 1
+                if stats is not None:
+                    stats.expanded += 1
+                if self.problem.is_goal(path.end()):  # solution found
+                    self.display(1, self.num_expanded, "paths have been expanded and",
+                                 len(self.frontier), "paths remain in the frontier")
+                    self.solution = path  # store the solution found
+                    if stats is not None:
+                        stats.visited = len(self.closed)
+                    return path
+                else:
+                    neighs = self.problem.neighbors(path.end())
+                    self.display(3, "Neighbors are", neighs)
+                    if stats is not None:
+                        stats.generated += len(neighs)
+                    for arc in neighs:
+                        if arc.to_node not in self.closed:
+                            self.add_to_frontier(Path(path, arc))
+                        elif stats is not None:
+                            stats.pruned += 1
+                self.display(3, "Frontier:", self.frontier)
+            elif stats is not None:
+                stats.pruned += 1
+        if stats is not None:
+            stats.visited = len(self.closed)
+        self.display(1, "No (more) solutions. Total of",
+                     self.num_expanded, "paths expanded.")
+
+
+class IDAStarSearcher(Displayable):
+    """returns a searcher for a problem.
+    This does iterative deepening A*: repeated depth-first searches bounded by
+    cost + problem.heuristic, raising the bound to the smallest value that
+    exceeded it.  Memory is linear in the solution length; only nodes on the
+    current path are checked for cycles.  With a finite heuristic an
+    unsolvable problem is searched until every simple path has been tried,
+    so run Board.unreachable_goal() first or use heur='exact', whose infinite
+    bound ends the search at once.
+    """
+
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem):
+        """creates a searcher from a problem
+        """
+        self.problem = problem
+        self.num_expanded = 0
+        super().__init__()
+        self.max_display_level
+
+    @visualize
+    def search(self):
+        """returns a path from the problem's start node
+        to a goal node.
+        Returns None if no path exists.
+        """
+        start = Path(self.problem.start_node())
+        if self.problem.is_goal(start.end()):
+            self.solution = start
+            return start
+        bound = self.problem.heuristic(start.end())
+        while bound is not None and bound != float('inf'):  # inf: the goal can't be reached
+            self.display(2, "Searching with bound", bound)
+            path, bound = self.bounded_search(start, bound)
+            if path is not None:  # solution found
+                self.display(1, self.num_expanded, "paths have been expanded")
+                self.solution = path  # store the solution found
+                return path
+        self.display(1, "No (more) solutions. Total of",
+                     self.num_expanded, "paths expanded.")
+
+    def bounded_search(self, start, bound):
+        """Depth-first search below *bound* from path *start*.
+        Returns (goal path, None) on success, otherwise (None, next bound),
+        where next bound is None when nothing was cut off.
+        """
+        problem = self.problem
+        stats = self.stats
+        next_bound = None
+        on_path = {start.end()}
+        self.num_expanded += 1
+        if stats is not None:
+            stats.expanded += 1
+        stack = [(start, iter(problem.neighbors(start.end())))]
+        while stack:
+            path, arcs = stack[-1]
+            arc = next(arcs, None)
+            if arc is None:  # all neighbors tried
+                stack.pop()
+                on_path.discard(path.end())
+                continue
+            if stats is not None:
+                stats.generated += 1
+            node = arc.to_node
+            if node in on_path:
+                if stats is not None:
+                    stats.pruned += 1
+                continue
+            new_path = Path(path, arc)
+            f_value = new_path.cost + problem.heuristic(node)
+            if f_value > bound:
+                if next_bound is None or f_value < next_bound:
+                    next_bound = f_value
+                if stats is not None:
+                    stats.pruned += 1
+                continue
+            if problem.is_goal(node):
+                return new_path, None
+            self.num_expanded += 1
+            on_path.add(node)
+            stack.append((new_path, iter(problem.neighbors(node))))
+            if stats is not None:
+                stats.expanded += 1
+                stats.frontier_size(len(stack))
+                stats.visited = max(stats.visited, len(on_path))
+        return None, next_bound
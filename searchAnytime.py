@@ -0,0 +1,178 @@
+#searchAnytime.py
+#CPOFFWEBSTER
+"""
+Generator-based search: progress as it happens, and alternative solutions
+on demand.
+
+    searcher = AnytimeSearcher(BloxorzProblem(board, heur='exact'))
+    for progress in searcher.progress(every=1000):
+        if progress.done or out_of_time():
+            break
+    hints = searcher.solutions()    # shortest first; each next() finds one more
+    first = next(hints)
+    second = next(hints, None)
+
+progress() is a breadth-first search that yields a Progress snapshot every
+*every* expansions and a last one with done set and the solution (None if
+there is none).  Stopping iterating stops the search.  solutions() lists the
+loopless start-to-goal paths in order of cost with Yen's algorithm, reusing
+the solution from progress() when there is one; each later path costs a
+handful of shortest-path searches guided by the problem's heuristic, so a
+problem with heur='exact' finds them quickest.
+"""
+
+import heapq
+import itertools
+from collections import namedtuple
+
+from searchCore import Displayable, arcs_path, parent_arcs, visualize
+
+Progress = namedtuple('Progress', 'depth expanded frontier done solution')
+
+
+class AnytimeSearcher(Displayable):
+    """returns a searcher for a problem.
+    search() returns the first (shortest) solution, as the other searchers do;
+    progress() and solutions() are the generator versions.
+    """
+
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem):
+        """creates a searcher from a problem
+        """
+        self.problem = problem
+        self.num_expanded = 0
+        self.solution = None
+        self.finished = False  # progress() has run to the end
+        super().__init__()
+        self.max_display_level
+
+    def progress(self, every=1000):
+        """Breadth-first search yielding a Progress every *every* expansions and when done."""
+        problem = self.problem
+        start = problem.start_node()
+        parent = {start: None}  # node -> arc it was first reached by
+        layer = [start]
+        depth = 0
+        stats = self.stats
+        goal = start if problem.is_goal(start) else None
+        while layer and goal is None:
+            self.display(2, "Expanding layer", depth, "of", len(layer), "nodes")
+            if stats is not None:
+                stats.frontier_size(len(layer))
+            next_layer = []
+            for k, node in enumerate(layer):
+                self.num_expanded += 1
+                neighs = problem.neighbors(node)
+                if stats is not None:
+                    stats.expanded += 1
+                    stats.generated += len(neighs)
+                for arc in neighs:
+                    if arc.to_node not in parent:
+                        parent[arc.to_node] = arc
+                        if problem.is_goal(arc.to_node):
+                            goal = arc.to_node
+                            break
+                        next_layer.append(arc.to_node)
+                    elif stats is not None:
+                        stats.pruned += 1
+                if goal is not None:
+                    break
+                if self.num_expanded % every == 0:
+                    yield Progress(depth, self.num_expanded, len(layer) - k - 1 + len(next_layer), False, None)
+            layer = next_layer
+            depth += 1
+        if goal is not None:
+            arcs = parent_arcs(parent, goal)
+            self.solution = arcs_path(start, arcs)
+            depth = len(arcs)
+            self.display(1, self.num_expanded, "paths have been expanded")
+        else:
+            self.display(1, "No (more) solutions. Total of",
+                         self.num_expanded, "paths expanded.")
+        self.finished = True
+        if stats is not None:
+            stats.visited = len(parent)
+        yield Progress(depth, self.num_expanded, len(layer), True, self.solution)
+
+    @visualize
+    def search(self):
+        """returns a shortest path from the problem's start node
+        to a goal node.
+        Returns None if no path exists.
+        """
+        if not self.finished:
+            for _ in self.progress():
+                pass
+        return self.solution
+
+    def spur_arcs(self, node, banned_nodes, banned_arcs):
+        """
+        Return the arcs of a cheapest path from *node* to a goal that enters
+        no node in *banned_nodes* and uses no (from, to, action) in
+        *banned_arcs*, or None.  A* with the problem's heuristic.
+        """
+        problem = self.problem
+        counter = itertools.count()
+        best = {node: 0}
+        parent = {node: None}
+        heap = [(problem.heuristic(node), 0, next(counter), node)]
+        while heap:
+            _, cost, _, node = heapq.heappop(heap)
+            if cost > best[node]:
+                continue  # stale entry
+            if problem.is_goal(node):
+                return parent_arcs(parent, node)
+            self.num_expanded += 1
+            neighs = problem.neighbors(node)
+            if self.stats is not None:
+                self.stats.expanded += 1
+                self.stats.generated += len(neighs)
+            for arc in neighs:
+                nxt = arc.to_node
+                if nxt in banned_nodes or (node, nxt, arc.action) in banned_arcs:
+                    continue
+                new_cost = cost + arc.cost
+                if new_cost < best.get(nxt, new_cost + 1):
+                    best[nxt] = new_cost
+                    parent[nxt] = arc
+                    heapq.heappush(heap, (new_cost + problem.heuristic(nxt), new_cost, next(counter), nxt))
+        return None
+
+    def solutions(self):
+        """Yield the distinct loopless solution Paths, cheapest first (Yen's algorithm)."""
+        first = self.search()
+        if first is None:
+            return
+        start = self.problem.start_node()
+        yield first
+        found = [first.arcs()]  # arcs of each path yielded so far
+        found_nodes = [[start] + [arc.to_node for arc in found[0]]]
+        seen = {tuple(found_nodes[0])}
+        candidates = []  # heap of (cost, counter, arcs)
+        counter = itertools.count()
+        while True:
+            last, nodes = found[-1], found_nodes[-1]
+            root_cost = 0
+            for i in range(len(last)):
+                # deviate from the last path at its i-th node, leaving by an
+                # arc no path found so far with the same root has used
+                root = nodes[:i + 1]
+                banned_arcs = {(arc.from_node, arc.to_node, arc.action)
+                               for arcs, path_nodes in zip(found, found_nodes)
+                               if path_nodes[:i + 1] == root for arc in arcs[i:i + 1]}
+                spur = self.spur_arcs(nodes[i], set(nodes[:i]), banned_arcs)
+                if spur is not None:
+                    arcs = last[:i] + spur
+                    key = tuple(root) + tuple(arc.to_node for arc in spur)
+                    if key not in seen:
+                        seen.add(key)
+                        heapq.heappush(candidates, (root_cost + sum(arc.cost for arc in spur), next(counter), arcs))
+                root_cost += last[i].cost
+            if not candidates:
+                return
+            _, _, arcs = heapq.heappop(candidates)
+            found.append(arcs)
+            found_nodes.append([start] + [arc.to_node for arc in arcs])
+            yield arcs_path(start, arcs)
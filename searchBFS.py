@@ -3,7 +3,8 @@
 
 
 
-from display import Displayable, visualize
+from searchCore import Displayable, Path, visualize
+from searchFrontier import FIFOFrontier
 
 
 class BFSSearcher(Displayable):
@@ -12,23 +13,28 @@ class BFSSearcher(Displayable):
     This does depth-first search unless overridden
     """
 
-    def __init__(self, problem):
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem, frontier_class=FIFOFrontier):
         """creates a searcher from a problem
+        *frontier_class* is called with no arguments to make the frontier
+        (see searchFrontier); the default FIFO queue gives breadth-first order.
         """
         self.problem = problem
+        self.frontier_class = frontier_class
         self.initialize_frontier()
         self.num_expanded = 0
         self.add_to_frontier(Path(problem.start_node()))
         super().__init__()
 
     def initialize_frontier(self):
-        self.frontier = []
+        self.frontier = self.frontier_class()
 
     def empty_frontier(self):
-        return self.frontier == []
+        return not self.frontier
 
     def add_to_frontier(self, path):
-        self.frontier.append(path)
+        self.frontier.add(path)
 
     @visualize
     def search(self):
@@ -36,10 +42,15 @@ class BFSSearcher(Displayable):
         to a goal node.
         Returns None if no path exists.
         """
+        stats = self.stats
         while not self.empty_frontier():
-            path = self.frontier.pop(0)  # dir([])    pop
+            if stats is not None:
+                stats.frontier_size(len(self.frontier))
+            path = self.frontier.pop()
             self.display(2, "Expanding:", path, "(cost:", path.cost, ")")
             self.num_expanded += 1
+            if stats is not None:
+                stats.expanded += 1
             if self.problem.is_goal(path.end()):  # solution found
                 self.display(1, self.num_expanded, "paths have been expanded and",
                              len(self.frontier), "paths remain in the frontier")
@@ -48,12 +59,10 @@ class BFSSearcher(Displayable):
             else:
                 neighs = self.problem.neighbors(path.end())
                 self.display(3, "Neighbors are", neighs)
+                if stats is not None:
+                    stats.generated += len(neighs)
                 for arc in reversed(neighs):
                     self.add_to_frontier(Path(path, arc))
                 self.display(3, "Frontier:", self.frontier)
         self.display(1, "No (more) solutions. Total of",
                      self.num_expanded, "paths expanded.")
-
-
-import heapq  # part of the Python standard library
-from searchProblem import Path
\ No newline at end of file
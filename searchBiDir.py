@@ -3,34 +3,39 @@
 
 
 
-from display import Displayable, visualize
+from searchCore import Arc, Displayable, Path, arcs_path, parent_arcs, visualize
 
 
 class BidirectionalSearcher(Displayable):
     """returns a searcher for a problem.
-    Paths can be found by repeatedly calling search().
-    This does depth-first search unless overridden
+    Searches breadth-first from the start and, over predecessor arcs
+    (problem.neighbors(node, False)), from the goal.  Each step expands a
+    whole layer of whichever side has the smaller frontier, and every newly
+    reached node is looked up in the other side's parent map, so the first
+    meeting found gives a shortest path.
     """
 
+    stats = None  # a search_stats.SearchStats to count into
+
     def __init__(self, problem):
         """creates a searcher from a problem
         """
         self.problem = problem
-        self.initialize_frontier()
-        self.initialize_f_frontier()
-        self.initialize_b_frontier()  # frontier for the bidirectional (back starting)
         self.num_f_expanded = 0
         self.num_b_expanded = 0
-        self.add_to_f_frontier(Path(problem.start_node()))
-        self.add_to_b_frontier(Path(problem.goal_node()))  # start state is the goal node
+        start, goal = problem.start_node(), problem.goal_node()
+        self.f_parent = {start: None}  # node -> arc it was reached by from the start side
+        self.b_parent = {goal: None}  # node -> arc leading from it toward the goal
+        self.initialize_f_frontier()
+        self.initialize_b_frontier()  # frontier for the bidirectional (back starting)
+        self.add_to_f_frontier(start)
+        self.add_to_b_frontier(goal)  # start state is the goal node
         super().__init__()
         self.max_display_level
-        self.f_closed = set()
-        self.b_closed = set()
-        self.new_path = []
 
-    def initialize_frontier(self):
-        self.frontier = []
+    @property
+    def num_expanded(self):
+        return self.num_f_expanded + self.num_b_expanded
 
     def initialize_f_frontier(self):
         self.f_frontier = []
@@ -39,25 +44,72 @@ class BidirectionalSearcher(Displayable):
         self.b_frontier = []
 
     def empty_f_frontier(self):
-        return self.f_frontier == []
+        return not self.f_frontier
 
     def empty_b_frontier(self):
-        return self.b_frontier == []
+        return not self.b_frontier
 
-    def add_to_f_frontier(self, path):
-        self.f_frontier.append(path)
+    def add_to_f_frontier(self, node):
+        self.f_frontier.append(node)
 
-    def add_to_b_frontier(self, b_path):
-        self.b_frontier.append(b_path)
+    def add_to_b_frontier(self, node):
+        self.b_frontier.append(node)
 
-    def merge_path(self, f_path, b_path):
-        forward = Path.arcs(f_path)
-        backward = Path.arcs_reversed(b_path)
-        for x in forward:
-            self.new_path.append(x)
-        for x in backward:
-            self.new_path.append(x)
-        return self.new_path
+    def expand_f_layer(self):
+        """Expand every node of the forward frontier; return a meeting node or None."""
+        layer = self.f_frontier
+        self.initialize_f_frontier()
+        f_parent, b_parent = self.f_parent, self.b_parent
+        stats = self.stats
+        for node in layer:
+            self.display(2, "Expanding forward:", node)
+            self.num_f_expanded += 1
+            neighs = self.problem.neighbors(node)
+            if stats is not None:
+                stats.expanded += 1
+                stats.generated += len(neighs)
+            for arc in neighs:
+                if arc.to_node not in f_parent:
+                    f_parent[arc.to_node] = arc
+                    if arc.to_node in b_parent:
+                        return arc.to_node
+                    self.add_to_f_frontier(arc.to_node)
+                elif stats is not None:
+                    stats.pruned += 1
+        return None
+
+    def expand_b_layer(self):
+        """Expand every node of the backward frontier; return a meeting node or None."""
+        layer = self.b_frontier
+        self.initialize_b_frontier()
+        f_parent, b_parent = self.f_parent, self.b_parent
+        stats = self.stats
+        for node in layer:
+            self.display(2, "Expanding backward:", node)
+            self.num_b_expanded += 1
+            neighs = self.problem.neighbors(node, False)
+            if stats is not None:
+                stats.expanded += 1
+                stats.generated += len(neighs)
+            for arc in neighs:
+                if arc.to_node not in b_parent:
+                    # store the arc the way it is travelled: predecessor -> node
+                    b_parent[arc.to_node] = Arc(arc.to_node, node, arc.cost, arc.action)
+                    if arc.to_node in f_parent:
+                        return arc.to_node
+                    self.add_to_b_frontier(arc.to_node)
+                elif stats is not None:
+                    stats.pruned += 1
+        return None
+
+    def merge_path(self, node):
+        """Return the Path from the start through meeting node *node* to the goal."""
+        path = arcs_path(self.problem.start_node(), parent_arcs(self.f_parent, node))
+        arc = self.b_parent[node]
+        while arc is not None:
+            path = Path(path, arc)
+            arc = self.b_parent[arc.to_node]
+        return path
 
     @visualize
     def search(self):
@@ -65,59 +117,27 @@ class BidirectionalSearcher(Displayable):
         to a goal node.
         Returns None if no path exists.
         """
+        start = self.problem.start_node()
+        if self.problem.is_goal(start) and self.num_expanded == 0:
+            self.num_f_expanded += 1
+            self.solution = Path(start)
+            return self.solution
+        stats = self.stats
         while not self.empty_f_frontier() and not self.empty_b_frontier():
-            path = self.f_frontier.pop(0)
-            if path.end() in self.b_closed:
-                # print("intersect beforehand")
-                path.list = self.merge_path(path, b_path)
-                self.solution = path.list
-                return path.list
-
-            b_path = self.b_frontier.pop(0)
-            if path.end() == b_path.end():
-                # print("intersection on")
-                path.list = self.merge_path(path, b_path)
-                self.solution = path.list
-                return path.list
-
-            if path.end() not in self.f_closed:
-                self.display(2, "Expanding:", path, "(cost:", path.cost, ")")
-
-                self.f_closed.add(path.end())  # add path to the visited list
-                self.num_f_expanded += 1
-
-                if self.problem.is_goal(path.end()):  # solution found
-                    self.display(1, self.num_f_expanded, "paths have been expanded and",
-                                 len(self.f_frontier + self.b_frontier), "paths remain in the frontier")
-                    self.solution = path  # store the solution found
-                    return path
-                else:
-                    neighs = self.problem.neighbors(path.end())
-                    self.display(3, "Neighbors are", neighs)
-                    for arc in reversed(neighs):
-                        self.add_to_f_frontier(Path(path, arc))
-                    self.display(3, "Frontier:", self.f_frontier)
-
-            if b_path.end() not in self.b_closed:
-                self.display(2, "Expanding:", b_path, "(cost:", b_path.cost, ")")
-                self.b_closed.add(b_path.end())  # add path to the visited list
-                self.num_b_expanded += 1
-
-                if self.problem.is_start(b_path.end()):  # solution found
-                    self.display(1, self.num_b_expanded, "paths have been expanded and",
-                                 len(self.b_frontier + self.f_frontier), "paths remain in the frontier")
-                    self.solution = b_path
-                    return b_path
-                else:
-                    neighs = self.problem.neighbors(b_path.end(), True)
-                    self.display(3, "Neighbors are", neighs)
-                    for arc in reversed(neighs):
-                        self.add_to_b_frontier(Path(b_path, arc))
-                    self.display(3, "Frontier:", self.f_frontier)
-
+            if stats is not None:
+                stats.frontier_size(len(self.f_frontier) + len(self.b_frontier))
+            if len(self.f_frontier) <= len(self.b_frontier):
+                meet = self.expand_f_layer()
+            else:
+                meet = self.expand_b_layer()
+            if meet is not None:  # solution found
+                self.display(1, self.num_expanded, "paths have been expanded and",
+                             len(self.f_frontier) + len(self.b_frontier), "paths remain in the frontier")
+                self.solution = self.merge_path(meet)  # store the solution found
+                if stats is not None:
+                    stats.visited = len(self.f_parent) + len(self.b_parent)
+                return self.solution
+        if stats is not None:
+            stats.visited = len(self.f_parent) + len(self.b_parent)
         self.display(1, "No (more) solutions. Total of",
-                     self.num_f_expanded, "paths expanded.")
-
-
-import heapq  # part of the Python standard library
-from searchProblem import Path
\ No newline at end of file
+                     self.num_expanded, "paths expanded.")
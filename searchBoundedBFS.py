@@ -0,0 +1,173 @@
+#searchBoundedBFS.py
+#CPOFFWEBSTER
+
+
+
+import tempfile
+from array import array
+
+from searchCore import Arc, Displayable, Path, arcs_path, visualize
+from bloxorz import ACTIONS, REVERSE_ACTION_INDEX, canonical_position, grid_index, grid_position, next_position
+
+
+class SpillingLayer(object):
+    """
+    A BFS layer of state ids that keeps at most *budget* ids in memory; the
+    rest go to a temporary file as packed uint32s and are streamed back in
+    chunks of *budget* when the layer is iterated.
+    """
+
+    def __init__(self, budget, directory=None):
+        self.budget = budget
+        self.directory = directory
+        self.buffer = array('I')
+        self.file = None
+        self.length = 0
+        self.num_spilled = 0
+
+    def __len__(self):
+        return self.length
+
+    def append(self, sid):
+        self.buffer.append(sid)
+        self.length += 1
+        if len(self.buffer) >= self.budget:
+            if self.file is None:
+                self.file = tempfile.TemporaryFile(dir=self.directory)
+            self.buffer.tofile(self.file)
+            self.num_spilled += len(self.buffer)
+            self.buffer = array('I')
+
+    def __iter__(self):
+        if self.file is not None:
+            self.file.seek(0)
+            while True:
+                chunk = array('I')
+                try:
+                    chunk.fromfile(self.file, self.budget)
+                except EOFError:  # last, short chunk; fromfile keeps what it read
+                    pass
+                if not chunk:
+                    break
+                yield from chunk
+        yield from self.buffer
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class BoundedBFSSearcher(Displayable):
+    """returns a searcher for a BloxorzProblem (or CompiledBloxorzProblem).
+    This does breadth-first search in memory that depends only on the board
+    size and *layer_budget*: states are numbered by bloxorz.grid_index,
+    the visited set is a bitmap (3 bits per square), the action
+    that first reached each state is kept in 2 bits, and a BFS layer with more
+    than *layer_budget* states is spilled to a temporary file in
+    *spill_dir* (default: the system temporary directory).  Only the
+    problem's board is used; the Path found is over block positions.
+    """
+
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem, layer_budget=1 << 20, spill_dir=None):
+        """creates a searcher from a problem
+        """
+        self.problem = problem
+        self.board = problem.board
+        self.layer_budget = layer_budget
+        self.spill_dir = spill_dir
+        num_ids = self.board.x_dim * self.board.y_dim * 3
+        self.visited = bytearray((num_ids + 7) // 8)
+        self.reached_by = bytearray((num_ids + 3) // 4)  # 2-bit action index per state
+        self.num_expanded = 0
+        self.num_spilled = 0
+        super().__init__()
+        self.max_display_level
+
+    def state_id(self, pos):
+        """Return the id of canonical position *pos* (see bloxorz.grid_index)."""
+        return grid_index(pos, self.board.x_dim, self.board.y_dim)
+
+    def position(self, sid):
+        """Return the canonical position of state id *sid*."""
+        return grid_position(sid, self.board.x_dim)
+
+    def mark(self, sid, action_idx):
+        """Mark *sid* visited, reached by ACTIONS[action_idx]."""
+        self.visited[sid >> 3] |= 1 << (sid & 7)
+        self.reached_by[sid >> 2] |= action_idx << ((sid & 3) * 2)
+
+    def path_to(self, pos):
+        """Build the Path from the start to *pos* by undoing the recorded actions."""
+        start = (self.board.start, self.board.start)
+        arcs = []
+        while pos != start:
+            sid = self.state_id(pos)
+            action_idx = (self.reached_by[sid >> 2] >> ((sid & 3) * 2)) & 3
+            prev = canonical_position(next_position(pos, ACTIONS[REVERSE_ACTION_INDEX[action_idx]]))
+            arcs.append(Arc(prev, pos, action=ACTIONS[action_idx]))
+            pos = prev
+        return arcs_path(start, reversed(arcs))
+
+    @visualize
+    def search(self):
+        """returns a path from the problem's start node
+        to a goal node.
+        Returns None if no path exists.
+        """
+        legal_position = self.board.legal_position
+        visited = self.visited
+        stats = self.stats
+        start = (self.board.start, self.board.start)
+        goal = (self.board.goal, self.board.goal)
+        if start == goal:
+            self.solution = Path(start)
+            return self.solution
+        self.mark(self.state_id(start), 0)
+        if stats is not None:
+            stats.visited += 1
+        layer = SpillingLayer(self.layer_budget, self.spill_dir)
+        layer.append(self.state_id(start))
+        depth = 0
+        while len(layer):
+            self.display(2, "Expanding layer", depth, "of", len(layer), "states")
+            if stats is not None:
+                stats.frontier_size(len(layer))
+            next_layer = SpillingLayer(self.layer_budget, self.spill_dir)
+            for sid in layer:
+                pos = self.position(sid)
+                self.num_expanded += 1
+                if stats is not None:
+                    stats.expanded += 1
+                for i, action in enumerate(ACTIONS):
+                    nxt = canonical_position(next_position(pos, action))
+                    if not legal_position(nxt):
+                        continue
+                    if stats is not None:
+                        stats.generated += 1
+                    nid = self.state_id(nxt)
+                    if visited[nid >> 3] & (1 << (nid & 7)):
+                        if stats is not None:
+                            stats.pruned += 1
+                        continue
+                    self.mark(nid, i)
+                    if stats is not None:
+                        stats.visited += 1
+                    if nxt == goal:  # solution found
+                        self.num_spilled += layer.num_spilled + next_layer.num_spilled
+                        layer.close()
+                        next_layer.close()
+                        self.display(1, self.num_expanded, "paths have been expanded and",
+                                     self.num_spilled, "states were spilled to disk")
+                        self.solution = self.path_to(goal)  # store the solution found
+                        return self.solution
+                    next_layer.append(nid)
+            self.num_spilled += layer.num_spilled
+            layer.close()
+            layer = next_layer
+            depth += 1
+        layer.close()
+        self.display(1, "No (more) solutions. Total of",
+                     self.num_expanded, "paths expanded.")
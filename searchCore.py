@@ -0,0 +1,139 @@
+#searchCore.py
+#CPOFFWEBSTER
+"""
+The search problem, arc and path classes and the display layer the searchers
+are built on.  Only the standard library is imported, so solver processes
+start quickly.
+
+Arc and Path use __slots__, so they carry no instance dictionary.  They are
+never changed once built (searchers share path prefixes); writes aren't
+blocked, as a guard would cost more per construction than it saves.
+
+Display is off by default: set a searcher's max_display_level to 1 or more
+to print its progress.
+"""
+
+
+class Displayable(object):
+    """Classes that print their progress with self.display(level, ...)."""
+
+    max_display_level = 0  # nothing is printed unless this is raised
+
+    def display(self, level, *args, **nargs):
+        """Print *args* (as print does) if *level* is at most max_display_level."""
+        if level <= self.max_display_level:
+            print(*args, **nargs)
+
+
+def visualize(func):
+    """Marks a search method; a hook for graphical front ends, a no-op here."""
+    return func
+
+
+class Search_problem(object):
+    """A search problem: a start node, a goal test, neighbors and a heuristic."""
+
+    def start_node(self):
+        """returns start node"""
+        raise NotImplementedError("start_node")
+
+    def is_goal(self, node):
+        """is True if node is a goal"""
+        raise NotImplementedError("is_goal")
+
+    def neighbors(self, node):
+        """returns a list of the arcs for the neighbors of node"""
+        raise NotImplementedError("neighbors")
+
+    def heuristic(self, n):
+        """Gives the heuristic value of node n.
+        Returns 0 if not overridden."""
+        return 0
+
+
+class Arc(object):
+    """An arc from from_node to to_node with a (non-negative) cost and an action label."""
+
+    __slots__ = ('from_node', 'to_node', 'cost', 'action')
+
+    def __init__(self, from_node, to_node, cost=1, action=None):
+        assert cost >= 0, "Cost cannot be negative for " + str(from_node) + "->" + str(to_node) + ", cost: " + str(cost)
+        self.from_node = from_node
+        self.to_node = to_node
+        self.cost = cost
+        self.action = action
+
+    def __repr__(self):
+        """string representation of an arc"""
+        if self.action:
+            return str(self.from_node) + " --" + str(self.action) + "--> " + str(self.to_node)
+        return str(self.from_node) + " --> " + str(self.to_node)
+
+
+class Path(object):
+    """A path is either a node or a path followed by an arc."""
+
+    __slots__ = ('initial', 'arc', 'cost')
+
+    def __init__(self, initial, arc=None):
+        """initial is either a node (in which case arc is None) or a path;
+        arc is an Arc from the end of initial, or None."""
+        self.initial = initial
+        self.arc = arc
+        self.cost = 0 if arc is None else initial.cost + arc.cost
+
+    def end(self):
+        """returns the node at the end of the path"""
+        return self.initial if self.arc is None else self.arc.to_node
+
+    def nodes(self):
+        """enumerates the nodes of the path from the last element backwards"""
+        current = self
+        while current.arc is not None:
+            yield current.arc.to_node
+            current = current.initial
+        yield current.initial
+
+    def arcs(self):
+        """returns the list of arcs of the path, from the start"""
+        arcs = []
+        current = self
+        while current.arc is not None:
+            arcs.append(current.arc)
+            current = current.initial
+        arcs.reverse()
+        return arcs
+
+    def initial_nodes(self):
+        """enumerates the nodes for the path before the end node.
+        This calls nodes() for the initial part of the path."""
+        if self.arc is not None:
+            yield from self.initial.nodes()
+
+    def __repr__(self):
+        """returns a string representation of a path"""
+        if self.arc is None:
+            return str(self.initial)
+        if self.arc.action:
+            return str(self.initial) + "\n   --" + str(self.arc.action) + "--> " + str(self.arc.to_node)
+        return str(self.initial) + " --> " + str(self.arc.to_node)
+
+
+def arcs_path(start, arcs):
+    """returns the Path from node *start* along the list *arcs*"""
+    path = Path(start)
+    for arc in arcs:
+        path = Path(path, arc)
+    return path
+
+
+def parent_arcs(parent, node):
+    """returns the list of arcs from the root to *node*, where *parent* maps
+    each node to the Arc it was reached by (None for the root)"""
+    arcs = []
+    arc = parent[node]
+    while arc is not None:
+        arcs.append(arc)
+        arc = parent[arc.from_node]
+    arcs.reverse()
+    return arcs
@@ -0,0 +1,75 @@
+#searchFrontier.py
+#CPOFFWEBSTER
+
+
+
+from collections import deque
+import heapq  # part of the Python standard library
+import itertools
+
+
+class FIFOFrontier(object):
+    """First in, first out frontier backed by a deque; gives breadth-first order.
+    add() and pop() are O(1).
+    """
+
+    def __init__(self):
+        self.paths = deque()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __repr__(self):
+        return repr(list(self.paths))
+
+    def add(self, path):
+        self.paths.append(path)
+
+    def pop(self):
+        return self.paths.popleft()
+
+
+class LIFOFrontier(object):
+    """Last in, first out frontier; gives depth-first order.
+    add() and pop() are O(1).
+    """
+
+    def __init__(self):
+        self.paths = []
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __repr__(self):
+        return repr(self.paths)
+
+    def add(self, path):
+        self.paths.append(path)
+
+    def pop(self):
+        return self.paths.pop()
+
+
+class PriorityFrontier(object):
+    """Frontier that pops the path with the smallest priority first, backed by a
+    binary heap.  *priority* maps a path to its value and defaults to the path
+    cost (lowest-cost-first).  Ties are broken first in, first out.
+    add() and pop() are O(log n).
+    """
+
+    def __init__(self, priority=None):
+        self.paths = []
+        self.priority = priority if priority is not None else (lambda path: path.cost)
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __repr__(self):
+        return repr([path for (_, _, path) in sorted(self.paths)])
+
+    def add(self, path):
+        heapq.heappush(self.paths, (self.priority(path), next(self.counter), path))
+
+    def pop(self):
+        return heapq.heappop(self.paths)[2]
@@ -0,0 +1,101 @@
+#searchLayeredBFS.py
+#CPOFFWEBSTER
+
+
+
+import numpy as np
+
+from searchCore import Arc, Displayable, arcs_path, visualize
+from bloxorz import ACTIONS
+
+
+def transition_matrix(states):
+    """Return the states x 4 int32 successor matrix of a StateSpace as a NumPy array."""
+    table = getattr(states, 'table', None)
+    if table is None:
+        table = np.frombuffer(states.successors, dtype=np.int32).reshape(-1, 4)
+    return table
+
+
+class LayeredBFSSearcher(Displayable):
+    """returns a searcher for a CompiledBloxorzProblem.
+    This does breadth-first search a whole layer at a time: the layer is an
+    array of state ids, its successors are gathered from the transition
+    matrix, visited states are masked out and the rest deduplicated with
+    np.unique.  Parent and action arrays rebuild the path to the goal.
+    """
+
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem):
+        """creates a searcher from a problem
+        """
+        self.problem = problem
+        self.table = transition_matrix(problem.states)
+        num_states = len(self.table)
+        self.visited = np.zeros(num_states, dtype=bool)
+        self.parent = np.full(num_states, -1, dtype=np.int32)
+        self.parent_action = np.full(num_states, -1, dtype=np.int8)
+        start = problem.start_node()
+        self.visited[start] = True
+        self.layer = np.array([start], dtype=np.int32)
+        self.depth = 0
+        self.num_expanded = 0
+        super().__init__()
+        self.max_display_level
+
+    def expand_layer(self):
+        """Replace self.layer by the unvisited states one roll away from it."""
+        layer = self.layer
+        self.num_expanded += len(layer)
+        successors = self.table[layer].ravel()
+        sources = np.repeat(layer, 4)
+        actions = np.tile(np.arange(4, dtype=np.int8), len(layer))
+        keep = successors >= 0
+        successors, sources, actions = successors[keep], sources[keep], actions[keep]
+        generated = len(successors)
+        keep = ~self.visited[successors]
+        successors, sources, actions = successors[keep], sources[keep], actions[keep]
+        successors, first = np.unique(successors, return_index=True)
+        stats = self.stats
+        if stats is not None:
+            stats.expanded += len(layer)
+            stats.generated += generated
+            stats.pruned += generated - len(successors)
+            stats.frontier_size(len(successors))
+            stats.visited += len(successors)
+        self.visited[successors] = True
+        self.parent[successors] = sources[first]
+        self.parent_action[successors] = actions[first]
+        self.layer = successors
+        self.depth += 1
+
+    def path_to(self, node):
+        """Build the Path from the start to state id *node* from the parent arrays."""
+        arcs = []
+        while self.parent[node] >= 0:
+            from_node = int(self.parent[node])
+            arcs.append(Arc(from_node, node, action=ACTIONS[self.parent_action[node]]))
+            node = from_node
+        return arcs_path(node, reversed(arcs))
+
+    @visualize
+    def search(self):
+        """returns a path from the problem's start node
+        to a goal node.
+        Returns None if no path exists.
+        """
+        goal = self.problem.goal_node()
+        if self.stats is not None and self.num_expanded == 0:
+            self.stats.visited += 1  # the start
+        while len(self.layer):
+            if self.visited[goal]:  # solution found
+                self.display(1, self.num_expanded, "paths have been expanded and",
+                             len(self.layer), "paths remain in the frontier")
+                self.layer = self.layer[:0]  # a later search() finds nothing more
+                self.solution = self.path_to(goal)  # store the solution found
+                return self.solution
+            self.display(2, "Expanding layer", self.depth, "of", len(self.layer), "states")
+            self.expand_layer()  # a newly reached goal is in the new layer
+        self.display(1, "No (more) solutions. Total of",
+                     self.num_expanded, "paths expanded.")
@@ -0,0 +1,208 @@
+#searchParallelBFS.py
+#CPOFFWEBSTER
+"""
+Breadth-first search of one large board on several processes.
+
+The successor table, a parent array, a claim array, the current BFS layer
+and an output block for the next layer live in multiprocessing.shared_memory
+blocks that every worker maps once, as NumPy arrays, when the pool starts.
+Each layer takes two rounds over the workers, each handed a (start, end)
+slice of the layer:
+
+    expand   look up the slice's successors in the shared table, claim the
+             unvisited ones by writing their parent and, in *claim*, the
+             layer index they were reached from, and write those whose
+             claim reads back unchanged to the worker's own region of the
+             output block (four entries per expanded state, so regions
+             never overlap)
+    dedupe   keep, in place, only the states whose claim falls in the
+             worker's slice, so a state two workers both reached is kept once
+
+Each returns only counts; the coordinator copies the kept regions into the
+next layer.  Nothing is pickled per state, and nothing is sorted.
+
+The parent array doubles as the visited set (-1 is unvisited).  A bitmap
+would be smaller but workers setting bits in the same byte would lose each
+other's updates; whole int32 writes can't clobber a neighbour.  When two
+workers reach a state in the same layer either parent is on a shortest path,
+and the parent and claim left behind need not come from the same worker.
+Requires numpy.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from searchCore import Arc, Displayable, Path, arcs_path, visualize
+from bloxorz import ACTIONS
+from searchLayeredBFS import transition_matrix
+
+_shared = {}  # in each worker: name -> NumPy array over a shared block
+_blocks = []  # in each worker: the SharedMemory objects, kept open
+
+NAMES = ('successors', 'parent', 'claim', 'layer', 'output')
+
+
+def _arrays(blocks, num_states):
+    """Map *blocks* (see NAMES) as int32 arrays of their used size."""
+    shapes = ((num_states, 4), (num_states,), (num_states,), (num_states,), (num_states * 4,))
+    return [np.ndarray(shape, dtype=np.int32, buffer=block.buf) for shape, block in zip(shapes, blocks)]
+
+
+def _attach(names, num_states):
+    """Pool initializer: map the shared blocks *names*."""
+    _blocks.extend(shared_memory.SharedMemory(name=name) for name in names)
+    _shared.update(zip(NAMES, _arrays(_blocks, num_states)))
+
+
+def _expand(successors, parent, claim, layer, output, start, end):
+    """
+    Expand layer[start:end], writing the states it claims to output[4 * start:];
+    return (how many were written, how many legal successors were generated).
+    """
+    found = successors[layer[start:end]].ravel()
+    index = np.repeat(np.arange(start, end, dtype=np.int32), 4)
+    keep = found >= 0
+    found, index = found[keep], index[keep]
+    generated = len(found)
+    keep = parent[found] < 0
+    found, index = found[keep], index[keep]
+    parent[found] = layer[index]
+    claim[found] = index
+    found = found[claim[found] == index]  # one entry per state reached twice in the slice
+    output[4 * start:4 * start + len(found)] = found
+    return len(found), generated
+
+
+def _dedupe(claim, output, start, end, count):
+    """
+    Keep, at the front of output[4 * start:], the *count* states written there
+    whose claim is in [start, end); return how many were kept.
+    """
+    found = output[4 * start:4 * start + count]
+    owner = claim[found]
+    found = found[(owner >= start) & (owner < end)]
+    output[4 * start:4 * start + len(found)] = found
+    return len(found)
+
+
+def _expand_slice(bounds):
+    """Worker task: expand one slice of the shared layer."""
+    start, end = bounds
+    return _expand(_shared['successors'], _shared['parent'], _shared['claim'], _shared['layer'],
+                   _shared['output'], start, end)
+
+
+def _dedupe_slice(task):
+    """Worker task: drop the states another slice claimed from one output region."""
+    start, end, count = task
+    return _dedupe(_shared['claim'], _shared['output'], start, end, count)
+
+
+class ParallelBFSSearcher(Displayable):
+    """returns a searcher for a CompiledBloxorzProblem.
+    Breadth-first search over the problem's state ids using *processes* worker
+    processes (default: one per CPU).  Layers smaller than *min_parallel*
+    states are expanded by the coordinator itself, as handing them out costs
+    more than it saves.
+    """
+
+    stats = None  # a search_stats.SearchStats to count into
+
+    def __init__(self, problem, processes=None, min_parallel=4096):
+        """creates a searcher from a problem
+        """
+        self.problem = problem
+        self.states = problem.states
+        self.processes = processes or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self.num_expanded = 0
+        super().__init__()
+        self.max_display_level
+
+    def path_to(self, parent, sid):
+        """Build the Path of state ids from the start to *sid* from the parent array."""
+        successors = self.states.successors
+        start = self.problem.start
+        arcs = []
+        while sid != start:
+            prev = int(parent[sid])
+            i = [successors[prev * 4 + i] for i in range(4)].index(sid)
+            arcs.append(Arc(prev, sid, action=ACTIONS[i]))
+            sid = prev
+        return arcs_path(start, reversed(arcs))
+
+    @visualize
+    def search(self):
+        """returns a path from the problem's start node
+        to a goal node.
+        Returns None if no path exists.
+        """
+        start, goal = self.problem.start, self.problem.goal
+        if start == goal:
+            self.num_expanded += 1
+            self.solution = Path(start)
+            return self.solution
+        num_states = self.states.num_states
+        stats = self.stats
+        if stats is not None:
+            stats.visited += 1  # the start
+        sizes = (num_states * 16, num_states * 4, num_states * 4, num_states * 4, num_states * 16)
+        blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        pool = None
+        try:
+            # arrays are sized by shape, not by the block, which may be rounded up to a page
+            successors, parent, claim, layer, output = _arrays(blocks, num_states)
+            successors[:] = transition_matrix(self.states)
+            parent[:] = -1
+            parent[start] = start
+            layer[0] = start
+            count = 1
+            depth = 0
+            while count:
+                self.display(2, "Expanding layer", depth, "of", count, "states")
+                if count < self.min_parallel or self.processes == 1:
+                    # one slice: nothing to dedupe, as its claims are all its own
+                    bounds = [(0, count)]
+                    results = [_expand(successors, parent, claim, layer, output, 0, count)]
+                    kept = [results[0][0]]
+                else:
+                    if pool is None:
+                        pool = multiprocessing.Pool(self.processes, _attach,
+                                                    ([block.name for block in blocks], num_states))
+                    step = -(-count // self.processes)
+                    bounds = [(k, min(k + step, count)) for k in range(0, count, step)]
+                    results = pool.map(_expand_slice, bounds)
+                    kept = pool.map(_dedupe_slice, [(first, last, written)
+                                                    for (first, last), (written, _) in zip(bounds, results)])
+                self.num_expanded += count
+                new_count = sum(kept)
+                if stats is not None:
+                    generated = sum(generated for _, generated in results)
+                    stats.expanded += count
+                    stats.generated += generated
+                    stats.pruned += generated - new_count
+                    stats.frontier_size(new_count)
+                    stats.visited += new_count
+                np.concatenate([output[4 * first:4 * first + n] for (first, _), n in zip(bounds, kept)],
+                               out=layer[:new_count])
+                count = new_count
+                if parent[goal] >= 0:  # solution found
+                    self.display(1, self.num_expanded, "paths have been expanded and",
+                                 count, "paths remain in the frontier")
+                    self.solution = self.path_to(parent, goal)  # store the solution found
+                    return self.solution
+                depth += 1
+            self.display(1, "No (more) solutions. Total of",
+                         self.num_expanded, "paths expanded.")
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+    # drop every array over the blocks before closing them
+            successors = parent = claim = layer = output = None
+            for block in blocks:
+                block.close()
+                block.unlink()
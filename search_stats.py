@@ -0,0 +1,91 @@
+#search_stats.py
+#CPOFFWEBSTER
+"""
+Low-overhead search metrics.  Assign a SearchStats to a searcher's *stats*
+attribute before calling search() and the searcher counts into it; with the
+default of None the searchers skip all bookkeeping.
+
+    searcher.stats = stats = SearchStats()
+    with stats.timing(problem):
+        searcher.search()
+    print(stats.as_dict())
+"""
+
+import contextlib
+import time
+
+import bloxorz_problem
+
+
+class SearchStats(object):
+    """
+    Counters filled in by a searcher:
+
+    expanded       nodes expanded
+    generated      arcs produced by expanding them
+    pruned         nodes dropped because they were already visited (or, for
+                   IDA*, on the current path or over the cost bound)
+    peak_frontier  largest frontier size seen
+    visited        size of the visited set(s) when search() returned
+
+    and, inside timing(), total seconds and calls per timed function.
+    """
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.pruned = 0
+        self.peak_frontier = 0
+        self.visited = 0
+        self.seconds = {}  # function name -> seconds, including any timed calls inside it
+        self.calls = {}  # function name -> number of calls
+
+    def __repr__(self):
+        return 'SearchStats(%s)' % ', '.join('%s=%r' % item for item in self.as_dict().items())
+
+    def as_dict(self):
+        return {'expanded': self.expanded, 'generated': self.generated, 'pruned': self.pruned,
+                'peak_frontier': self.peak_frontier, 'visited': self.visited,
+                'seconds': dict(self.seconds), 'calls': dict(self.calls)}
+
+    def frontier_size(self, size):
+        """Record a frontier size, keeping the peak."""
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def timed(self, name, func):
+        """Return *func* wrapped to add its run time and calls under *name*."""
+        seconds, calls = self.seconds, self.calls
+        seconds.setdefault(name, 0.0)
+        calls.setdefault(name, 0)
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            begin = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[name] += perf_counter() - begin
+                calls[name] += 1
+        return wrapper
+
+    @contextlib.contextmanager
+    def timing(self, problem):
+        """
+        Within the block, time *problem*.neighbors, its board's legal_position
+        and bloxorz_problem.next_position.  Everything is restored afterwards.
+        Compiled problems read a transition table, so only neighbors is called.
+        """
+        board = getattr(problem, 'board', None)
+        next_position = bloxorz_problem.next_position
+        problem.neighbors = self.timed('neighbors', problem.neighbors)
+        if board is not None:
+            board.legal_position = self.timed('legal_position', board.legal_position)
+        bloxorz_problem.next_position = self.timed('next_position', next_position)
+        try:
+            yield self
+        finally:
+            bloxorz_problem.next_position = next_position
+            if board is not None:
+                del board.legal_position
+            del problem.neighbors
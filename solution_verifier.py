@@ -0,0 +1,153 @@
+#solution_verifier.py
+#CPOFFWEBSTER
+"""
+Check submitted action strings (such as 'RRDL') against a board in bulk:
+
+    verifier = SolutionVerifier(board)
+    verdicts = verifier.verify(['RDLULU', 'RRRR', 'LDRULUU'])
+
+Each verdict is a dict:
+
+    status    'solved'      the moves end with the block upright on the goal
+              'fell'        move number *step* (from 0) leaves the block off
+                            the board or upright on a weak tile
+              'unfinished'  every move is legal but the block isn't on the goal
+              'invalid'     character *step* isn't one of bloxorz.ACTIONS
+    step      as above, None for solved and unfinished submissions
+    length    number of characters submitted
+    optimal   for solved submissions whether length is the shortest possible,
+              otherwise None
+
+Moves are replayed through the board's StateSpace transition table rather
+than next_position and legal_position.  With NumPy installed every
+submission advances one move per array operation; without it each is
+walked through the table in turn.  From the command line, one submission per
+line:
+
+    python solution_verifier.py boards/1.blx submissions.txt
+"""
+
+import argparse
+import json
+
+from bloxorz import ACTIONS, Board
+
+try:
+    import numpy as np
+except ImportError:  # numpy is not installed; verify one submission at a time
+    np = None
+
+# move codes: ACTIONS index, then an unknown character, then past the end
+INVALID, END = len(ACTIONS), len(ACTIONS) + 1
+ACTION_CODES = {action: i for i, action in enumerate(ACTIONS)}
+
+
+class SolutionVerifier(object):
+    """
+    Verifies action strings for one board.  *shortest* is the length of the
+    board's shortest solution (None if it has none).
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.states = board.state_space()
+        self.start = self.states.encode((board.start, board.start))
+        self.goal = self.states.encode((board.goal, board.goal))
+        distance = board.distance_map().distances[self.start]
+        self.shortest = None if distance < 0 else distance
+        self._table = None
+
+    def verdict(self, status, step, length):
+        optimal = length == self.shortest if status == 'solved' else None
+        return {'status': status, 'step': step, 'length': length, 'optimal': optimal}
+
+    def verify(self, submissions):
+        """Return a verdict for each action string in *submissions*, in order."""
+        if np is None:
+            return [self.verify_one(actions) for actions in submissions]
+        return self.verify_arrays(list(submissions))
+
+    def verify_one(self, actions):
+        """Return the verdict for one action string, walking the transition table."""
+        successors = self.states.successors
+        sid = self.start
+        for step, action in enumerate(actions):
+            code = ACTION_CODES.get(action)
+            if code is None:
+                return self.verdict('invalid', step, len(actions))
+            sid = successors[sid * 4 + code]
+            if sid < 0:
+                # a later bad character would still make the string invalid
+                for later, action in enumerate(actions[step + 1:], step + 1):
+                    if action not in ACTION_CODES:
+                        return self.verdict('invalid', later, len(actions))
+                return self.verdict('fell', step, len(actions))
+        return self.verdict('solved' if sid == self.goal else 'unfinished', None, len(actions))
+
+    def transition_table(self):
+        """
+        The (states + 1) x 6 array of next states by move code.  The extra
+        last state is a sink for fallen blocks; END leaves a state unchanged.
+        """
+        if self._table is None:
+            num_states = self.states.num_states
+            table = np.empty((num_states + 1, END + 1), dtype=np.int32)
+            table[:num_states, :INVALID] = np.frombuffer(self.states.successors, dtype=np.int32).reshape(-1, 4)
+            table[:num_states, :INVALID][table[:num_states, :INVALID] < 0] = num_states
+            table[:, INVALID] = num_states
+            table[:, END] = np.arange(num_states + 1)
+            table[num_states, :] = num_states
+            self._table = table
+        return self._table
+
+    def verify_arrays(self, submissions):
+        """verify() with every submission replayed in lockstep through NumPy arrays."""
+        if not submissions:
+            return []
+        table = self.transition_table()
+        sink = self.states.num_states
+        lengths = np.fromiter(map(len, submissions), dtype=np.int64, count=len(submissions))
+        width = int(lengths.max())
+        if width == 0:  # nothing to replay; every block is still at the start
+            return [self.verify_one(actions) for actions in submissions]
+        # one row of move codes per submission, padded with END
+        lookup = np.full(256, INVALID, dtype=np.uint8)
+        for action, code in ACTION_CODES.items():
+            lookup[ord(action)] = code
+        chars = np.frombuffer(''.join(submissions).encode('latin-1', 'replace'), dtype=np.uint8)
+        moves = np.full((len(submissions), width), END, dtype=np.uint8)
+        moves[np.arange(width) < lengths[:, None]] = lookup[chars]
+        moves = np.ascontiguousarray(moves.T)  # step-major, so each step reads one row
+
+        state = np.full(len(submissions), self.start, dtype=np.int32)
+        fell_at = np.full(len(submissions), -1, dtype=np.int64)
+        for step in range(width):
+            state = table[state, moves[step]]
+            fell_at[(state == sink) & (fell_at < 0)] = step
+
+        bad = moves == INVALID
+        first_bad = np.where(bad.any(axis=0), bad.argmax(axis=0), -1)
+        verdicts = []
+        for length, bad_at, fell, end in zip(lengths.tolist(), first_bad.tolist(), fell_at.tolist(), state.tolist()):
+            if bad_at >= 0:
+                verdicts.append(self.verdict('invalid', bad_at, length))
+            elif fell >= 0:
+                verdicts.append(self.verdict('fell', fell, length))
+            else:
+                verdicts.append(self.verdict('solved' if end == self.goal else 'unfinished', None, length))
+        return verdicts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Verify submitted action strings for a board.')
+    parser.add_argument('board', help='board file (.blx or .blx2)')
+    parser.add_argument('submissions', type=argparse.FileType('r'), help='file with one action string per line')
+    args = parser.parse_args(argv)
+    verifier = SolutionVerifier(Board.load_board(args.board))
+    submissions = [line.strip() for line in args.submissions]
+    for actions, verdict in zip(submissions, verifier.verify(submissions)):
+        print(json.dumps(dict(actions=actions, **verdict)))
+
+
+if __name__ == '__main__':
+    main()
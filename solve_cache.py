@@ -0,0 +1,194 @@
+#solve_cache.py
+#CPOFFWEBSTER
+"""
+On-disk cache of Bloxorz solutions and distance maps, keyed by a hash of the
+board contents.
+
+Each board gets up to two files in the cache directory, named by its key:
+
+    <key>.sol   the shortest action string in ASCII, or '-' if there is none
+    <key>.dist  a distance map: a header followed by a little-endian int32
+                per (cell, orientation), memory-mapped on read
+
+Least recently used files are deleted once the directory grows past its
+size limit.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from bloxorz import ACTIONS, canonical_position, grid_index, next_position
+
+NO_SOLUTION = b'-'
+
+DIST_MAGIC = b'BLXD'
+DIST_VERSION = 1
+DIST_HEADER = struct.Struct('<4sIII')  # magic, version, x_dim, y_dim
+
+def board_key(board):
+    """
+    Return the hex digest identifying *board*: its dimensions, normalized rows,
+    start and goal.
+    """
+    digest = hashlib.sha256()
+    digest.update(('%d %d\n' % (board.x_dim, board.y_dim)).encode('ascii'))
+    for row in board.rows:
+        digest.update(''.join(row).encode('ascii'))
+        digest.update(b'\n')
+    digest.update(('%s %s' % (board.start, board.goal)).encode('ascii'))
+    return digest.hexdigest()
+
+
+class MappedDistances(object):
+    """
+    A distance map read back from a .dist file.  The grid stays memory-mapped,
+    so opening it costs one read of the header.
+    """
+
+    def __init__(self, file_name):
+        with open(file_name, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.x_dim, self.y_dim = DIST_HEADER.unpack_from(self.map)
+        if magic != DIST_MAGIC or version != DIST_VERSION:
+            self.map.close()
+            raise ValueError("expected distance map header, but got %s" % ((magic, version),))
+        if sys.byteorder == 'little':
+            self.grid = memoryview(self.map)[DIST_HEADER.size:].cast('i')
+        else:  # the file is little-endian; copy and swap rather than map
+            self.grid = array('i', self.map[DIST_HEADER.size:])
+            self.grid.byteswap()
+
+    def close(self):
+        if isinstance(self.grid, memoryview):
+            self.grid.release()
+        self.map.close()
+
+    def distance(self, pos):
+        """Return the number of rolls from *pos* to the goal, or None."""
+        idx = grid_index(canonical_position(pos), self.x_dim, self.y_dim)
+        if idx is None or self.grid[idx] < 0:
+            return None
+        return self.grid[idx]
+
+    def solution(self, pos):
+        """Return a shortest action string from *pos* to the goal, or None."""
+        distance = self.distance(pos)
+        if distance is None:
+            return None
+        pos = canonical_position(pos)
+        actions = []
+        while distance > 0:
+            for action in ACTIONS:
+                nxt = canonical_position(next_position(pos, action))
+                if self.distance(nxt) == distance - 1:
+                    actions.append(action)
+                    pos, distance = nxt, distance - 1
+                    break
+        return ''.join(actions)
+
+
+class SolutionCache(object):
+    """
+    Size-bounded, least recently used cache of solutions and distance maps in
+    *directory*.  Reading an entry marks it as recently used.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def file_name(self, board, extension):
+        return os.path.join(self.directory, board_key(board) + extension)
+
+    def get_solution(self, board):
+        """
+        Return the cached action string for *board*, or None if the board is
+        cached as unsolvable.  Raises KeyError if it isn't cached.
+        """
+        file_name = self.file_name(board, '.sol')
+        try:
+            with open(file_name, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            raise KeyError(board_key(board))
+        os.utime(file_name)
+        return None if data == NO_SOLUTION else data.decode('ascii')
+
+    def put_solution(self, board, solution):
+        """Store action string *solution* (None if unsolvable) for *board*."""
+        data = NO_SOLUTION if solution is None else solution.encode('ascii')
+        self.write(self.file_name(board, '.sol'), data)
+
+    def get_distances(self, board):
+        """
+        Return the cached MappedDistances for *board*.
+        Raises KeyError if it isn't cached.
+        """
+        file_name = self.file_name(board, '.dist')
+        try:
+            distances = MappedDistances(file_name)
+        except FileNotFoundError:
+            raise KeyError(board_key(board))
+        os.utime(file_name)
+        return distances
+
+    def put_distances(self, board, distance_map):
+        """Store *distance_map* (a bloxorz.DistanceMap for *board*)."""
+        grid = array('i', [-1]) * (board.x_dim * board.y_dim * 3)
+        distances = distance_map.distances
+        for sid, pos in enumerate(distance_map.states.positions):
+            grid[grid_index(pos, board.x_dim, board.y_dim)] = distances[sid]
+        if sys.byteorder != 'little':
+            grid.byteswap()
+        data = DIST_HEADER.pack(DIST_MAGIC, DIST_VERSION, board.x_dim, board.y_dim)
+        self.write(self.file_name(board, '.dist'), data, grid)
+
+    def solve(self, board, store_distances=False):
+        """
+        Return the shortest action string for *board* (None if unsolvable),
+        from the cache when possible.  Otherwise solve it with the board's
+        DistanceMap and store the result, and the map if *store_distances*.
+        """
+        try:
+            return self.get_solution(board)
+        except KeyError:
+            pass
+        distance_map = board.distance_map()
+        solution = distance_map.solution((board.start, board.start))
+        self.put_solution(board, solution)
+        if store_distances:
+            self.put_distances(board, distance_map)
+        return solution
+
+    def write(self, file_name, *chunks):
+        """Write *chunks* (bytes-like) to *file_name* atomically, then evict down to max_bytes."""
+        temp_name = '%s.%d.tmp' % (file_name, os.getpid())
+        with open(temp_name, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temp_name, file_name)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(('.sol', '.dist')):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,118 @@
+#solve_service.py
+#CPOFFWEBSTER
+"""
+Asyncio front end for the solvers, for use behind a web endpoint:
+
+    service = SolveService(max_concurrency=4)
+    actions = await service.solve(board, timeout=5.0)
+
+Searches run on a thread pool so the event loop stays responsive, at most
+*max_concurrency* at a time.  Concurrent requests for an identical board share
+one search.  When every request waiting on a search has timed out or been
+cancelled, the search is stopped at its next expansion.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+from batch_solve import SEARCHERS
+from bloxorz_problem import CompiledBloxorzProblem, path_actions
+from solve_cache import board_key
+
+
+# batch_solve.SEARCHERS entries that expand through problem.neighbors, where
+# cancellation is checked; the others run their own loops and can't be stopped
+CANCELLABLE = ('bfs', 'bfs-enqueue', 'bidirectional', 'astar', 'idastar')
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class _Job(object):
+    """One in-flight search and the requests waiting on it."""
+
+    def __init__(self):
+        self.cancel = threading.Event()
+        self.waiters = 0
+        self.task = None
+
+
+class SolveService(object):
+    """
+    Solves boards with the batch_solve.SEARCHERS entry *searcher*, returning
+    action strings, or None for unsolvable boards.  Only the CANCELLABLE
+    searchers are accepted.
+    """
+
+    def __init__(self, max_concurrency=4, searcher='bfs'):
+        if searcher not in CANCELLABLE:
+            raise ValueError("expected a searcher in %s, got %s" % (CANCELLABLE, searcher))
+        self.searcher = searcher
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+        self.semaphore = None  # made on first use, inside the running loop
+        self.max_concurrency = max_concurrency
+        self.jobs = {}  # board key -> _Job
+
+    def close(self):
+        """Stop all searches and shut the thread pool down."""
+        for job in self.jobs.values():
+            job.cancel.set()
+        self.executor.shutdown(wait=False)
+
+    async def solve(self, board, timeout=None):
+        """
+        Return the shortest action string for *board*, or None if it has no
+        solution.  Raises asyncio.TimeoutError after *timeout* seconds.
+        """
+        key = board_key(board)
+        job = self.jobs.get(key)
+        if job is None:
+            job = self.jobs[key] = _Job()
+            job.task = asyncio.ensure_future(self.run(board, job))
+            job.task.add_done_callback(lambda task: self.forget(key, job))
+        job.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.task), timeout)
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.task.done():
+                # nobody wants the answer any more
+                job.cancel.set()
+                job.task.cancel()
+                self.forget(key, job)
+
+    def forget(self, key, job):
+        if self.jobs.get(key) is job:
+            del self.jobs[key]
+
+    async def run(self, board, job):
+        """Run one search on the thread pool, within the concurrency limit."""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.search, board, job.cancel)
+
+    def search(self, board, cancel):
+        """
+        Solve *board* in the calling thread.  Raises SearchCancelled at the
+        next expansion after *cancel* is set.
+        """
+        if cancel.is_set():
+            raise SearchCancelled()
+        if board.unreachable_goal():
+            return None
+        problem = CompiledBloxorzProblem(board)
+        neighbors = problem.neighbors
+
+        def checked_neighbors(node, forward=True):
+            if cancel.is_set():
+                raise SearchCancelled()
+            return neighbors(node, forward)
+        problem.neighbors = checked_neighbors
+        searcher = SEARCHERS[self.searcher](problem)
+        searcher.max_display_level = 0
+        path = searcher.search()
+        return None if path is None else path_actions(path)
@@ -0,0 +1,68 @@
+#test_anytime.py
+#CPOFFWEBSTER
+"""AnytimeSearcher: progress snapshots and solutions() ordering."""
+
+import itertools
+
+import pytest
+
+from bloxorz import Board
+from bloxorz_problem import BloxorzProblem, CompiledBloxorzProblem, path_actions
+from searchAnytime import AnytimeSearcher
+from search_stats import SearchStats
+
+
+def loopless_solutions(problem, max_cost):
+    """Every loopless start-to-goal action string of at most *max_cost* rolls, by brute force."""
+    found = []
+    start = problem.start_node()
+
+    def extend(node, on_path, actions):
+        if problem.is_goal(node):
+            found.append(''.join(actions))
+            return
+        if len(actions) == max_cost:
+            return
+        for arc in problem.neighbors(node):
+            if arc.to_node not in on_path:
+                on_path.add(arc.to_node)
+                actions.append(arc.action)
+                extend(arc.to_node, on_path, actions)
+                actions.pop()
+                on_path.discard(arc.to_node)
+    extend(start, {start}, [])
+    return found
+
+
+@pytest.mark.parametrize('name', ['1', '2', '3', 'test'])
+def test_solutions_in_cost_order(name):
+    board = Board.load_board('boards/%s.blx' % name)
+    solutions = [path_actions(path) for path in
+                 itertools.islice(AnytimeSearcher(CompiledBloxorzProblem(board, heur='exact')).solutions(), 30)]
+    lengths = [len(actions) for actions in solutions]
+    assert lengths == sorted(lengths)
+    assert lengths[0] == len(board.solution_from(board.start))
+    assert len(set(solutions)) == len(solutions)
+    # below the longest length returned, nothing may be missing
+    expected = loopless_solutions(BloxorzProblem(board), lengths[-1])
+    assert set(solutions) <= set(expected)
+    assert (sorted(actions for actions in solutions if len(actions) < lengths[-1]) ==
+            sorted(actions for actions in expected if len(actions) < lengths[-1]))
+
+
+def test_progress_snapshots():
+    board = Board.load_board('boards/6.blx')
+    searcher = AnytimeSearcher(BloxorzProblem(board))
+    searcher.stats = stats = SearchStats()
+    snapshots = list(searcher.progress(every=10))
+    assert [snapshot.done for snapshot in snapshots] == [False] * (len(snapshots) - 1) + [True]
+    assert [snapshot.expanded for snapshot in snapshots[:-1]] == list(range(10, 10 * len(snapshots) - 9, 10))
+    assert snapshots[-1].depth == snapshots[-1].solution.cost == 24
+    assert stats.expanded == searcher.num_expanded
+    assert searcher.search() is snapshots[-1].solution
+
+
+def test_unsolvable():
+    searcher = AnytimeSearcher(BloxorzProblem(Board(['SXOXG', 'XXOXX'])))
+    assert searcher.search() is None
+    assert list(searcher.solutions()) == []
@@ -0,0 +1,17 @@
+#test_astar.py
+#CPOFFWEBSTER
+"""IDAStarSearcher gives up at once when the exact heuristic says the goal can't be reached."""
+
+from bloxorz import Board
+from bloxorz_problem import BloxorzProblem
+from searchAStar import IDAStarSearcher
+
+
+def test_idastar_exact_unsolvable():
+    board = Board(['SXXXXOO',
+                   'XXXXXOO',
+                   'XXXXXOO',
+                   'XXXXXOG'])
+    searcher = IDAStarSearcher(BloxorzProblem(board, heur='exact'))
+    assert searcher.search() is None
+    assert searcher.num_expanded == 0
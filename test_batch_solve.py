@@ -0,0 +1,29 @@
+#test_batch_solve.py
+#CPOFFWEBSTER
+"""batch_solve.solve_all: a worker that dies costs one board, not the batch."""
+
+import io
+import json
+import os
+
+import batch_solve
+
+solve_file = batch_solve.solve_file
+
+
+def crashing_solve_file(file_name, *args):
+    """solve_file, except that the worker dies outright on a 'crash' board."""
+    if 'crash' in file_name:
+        os._exit(1)
+    return solve_file(file_name, *args)
+
+
+def test_dead_worker_costs_one_board(monkeypatch):
+    monkeypatch.setattr(batch_solve, 'solve_file', crashing_solve_file)
+    files = ['boards/1.blx', 'boards/2.blx', 'crash.blx', 'boards/3.blx', 'boards/6.blx', 'boards/test.blx']
+    output = io.StringIO()
+    solved = batch_solve.solve_all(files, output, workers=2)
+    records = {record['board']: record for record in map(json.loads, output.getvalue().splitlines())}
+    assert sorted(records) == sorted(files)
+    assert records['crash.blx']['status'] == 'error'
+    assert solved == len(files) - 1
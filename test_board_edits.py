@@ -0,0 +1,70 @@
+#test_board_edits.py
+#CPOFFWEBSTER
+"""Tile edits: Board.set_tile and IncrementalSolver repair, on both board classes."""
+
+import random
+
+import pytest
+
+from bloxorz import Board, DistanceMap, StateSpace
+from incremental_solver import IncrementalSolver
+
+try:
+    from bloxorz_numpy import NumpyBoard
+    BOARD_CLASSES = [Board, NumpyBoard]
+except ImportError:  # numpy is not installed
+    BOARD_CLASSES = [Board]
+
+
+def full_distances(board):
+    """Distances from a DistanceMap compiled from scratch, keyed by position."""
+    distance_map = DistanceMap(StateSpace(Board(board.rows)))
+    positions = distance_map.states.positions
+    return {positions[sid]: distance for sid, distance in enumerate(distance_map.distances) if distance >= 0}
+
+
+@pytest.mark.parametrize('board_class', BOARD_CLASSES)
+def test_set_tile_rebuilds_state_space(board_class):
+    board = board_class(['SXXXXXG', 'XXXXXXX'])
+    assert board.distance_map().solution(((0, 0), (0, 0))) == 'RRRR'
+    for x in range(1, 6):
+        board.set_tile((x, 0), 'O')
+        board.set_tile((x, 1), 'O')
+    assert board.unreachable_goal()
+    assert board.distance_map().solution(((0, 0), (0, 0))) is None
+    assert not board.on_board((3, 0))
+
+
+@pytest.mark.parametrize('board_class', BOARD_CLASSES)
+def test_set_tile_weak(board_class):
+    board = board_class(['SXXXG'])
+    board.set_tile((2, 0), 'W')
+    assert not board.legal_position(((2, 0), (2, 0)))
+    assert board.legal_position(((2, 0), (3, 0)))
+
+
+@pytest.mark.parametrize('board_class', BOARD_CLASSES)
+def test_incremental_repair_matches_recompute(board_class):
+    rng = random.Random(16)
+    for _ in range(20):
+        rows = [''.join(rng.choice('XXXXWO') for _ in range(9)) for _ in range(7)]
+        rows[0] = 'S' + rows[0][1:]
+        rows[6] = rows[6][:8] + 'G'
+        board = board_class(rows)
+        solver = IncrementalSolver(board)
+        for _ in range(6):
+            edits = [((rng.randrange(9), rng.randrange(7)), rng.choice('XOW')) for _ in range(rng.randint(1, 3))]
+            edits = {square: tile for square, tile in edits if square not in (board.start, board.goal)}
+            solver.set_tiles(edits)
+            assert solver.distances == full_distances(board)
+
+
+@pytest.mark.parametrize('board_class', BOARD_CLASSES)
+def test_rejected_edit_still_repairs(board_class):
+    board = board_class(['SXXXXXG', 'XXXXXXX'])
+    solver = IncrementalSolver(board)
+    with pytest.raises(ValueError):
+        solver.set_tiles({(3, 0): 'O', (3, 1): 'O', (0, 0): 'O'})
+    assert solver.distances == full_distances(board)
+    assert solver.distance(((0, 0), (0, 0))) is None
+    assert solver.solution(((0, 0), (0, 0))) is None
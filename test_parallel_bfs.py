@@ -0,0 +1,40 @@
+#test_parallel_bfs.py
+#CPOFFWEBSTER
+"""ParallelBFSSearcher agrees with LayeredBFSSearcher, path and stats, with and without workers."""
+
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from bloxorz import Board
+from bloxorz_problem import CompiledBloxorzProblem
+from searchLayeredBFS import LayeredBFSSearcher
+from searchParallelBFS import ParallelBFSSearcher
+from search_stats import SearchStats
+
+COUNTERS = ('expanded', 'generated', 'pruned', 'peak_frontier', 'visited')
+
+
+@pytest.mark.parametrize('processes, min_parallel', [(1, 4096), (3, 1)])
+def test_matches_layered(processes, min_parallel):
+    rng = random.Random(22)
+    for _ in range(10):
+        size = rng.randint(5, 30)
+        rows = [''.join(rng.choice('XXXXXWO') for _ in range(size)) for _ in range(size)]
+        rows[0] = 'S' + rows[0][1:]
+        rows[-1] = rows[-1][:-1] + 'G'
+        board = Board(rows)
+        expected = LayeredBFSSearcher(CompiledBloxorzProblem(board))
+        expected.stats = SearchStats()
+        expected_path = expected.search()
+        searcher = ParallelBFSSearcher(CompiledBloxorzProblem(board), processes, min_parallel)
+        searcher.stats = SearchStats()
+        path = searcher.search()
+        assert (path is None) == (expected_path is None)
+        if path is not None:
+            assert path.cost == expected_path.cost
+            assert len(set(path.nodes())) == path.cost + 1
+        assert ([getattr(searcher.stats, name) for name in COUNTERS] ==
+                [getattr(expected.stats, name) for name in COUNTERS])
@@ -0,0 +1,63 @@
+#test_precheck.py
+#CPOFFWEBSTER
+"""Board.unreachable_goal: what it rejects, what it leaves to search, and that it is sound."""
+
+import random
+
+from bloxorz import Board
+
+
+def solvable(board):
+    return board.distance_map().distance((board.start, board.start)) is not None
+
+
+def test_separate_components():
+    board = Board(['SXOXG',
+                   'XXOXX'])
+    assert board.unreachable_goal()
+    assert not solvable(board)
+
+
+def test_parity_rejected():
+    # a corridor one square wide: upright squares only 3 apart are reachable
+    board = Board(['SXXXG'])
+    assert board.unreachable_goal()
+    assert not solvable(board)
+
+
+def test_parity_agrees():
+    board = Board(['SXXGX'])
+    assert not board.unreachable_goal()
+    assert solvable(board)
+
+
+def test_two_by_two_patch_is_inconclusive():
+    # the patch lets a lying block roll sideways, which changes the parity
+    board = Board(['SXXXG',
+                   'XXOOO'])
+    assert not board.unreachable_goal()
+
+
+def test_patch_in_another_component_does_not_count():
+    board = Board(['SXXXGOXX',
+                   'OOOOOOXX'])
+    assert board.unreachable_goal()
+
+
+def test_weak_tiles_count_as_floor():
+    # a lying block may rest on weak tiles, so they connect components
+    board = Board(['SXWGX'])
+    assert not board.unreachable_goal()
+    assert solvable(board)
+
+
+def test_never_rejects_a_solvable_board():
+    rng = random.Random(20)
+    for _ in range(500):
+        x_dim, y_dim = rng.randint(2, 10), rng.randint(1, 8)
+        rows = [[rng.choice('OOXXXW') for _ in range(x_dim)] for _ in range(y_dim)]
+        (sx, sy), (gx, gy) = rng.sample([(x, y) for y in range(y_dim) for x in range(x_dim)], 2)
+        rows[sy][sx], rows[gy][gx] = 'S', 'G'
+        board = Board([''.join(row) for row in rows])
+        if board.unreachable_goal():
+            assert not solvable(board), board.rows
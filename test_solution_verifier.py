@@ -0,0 +1,24 @@
+#test_solution_verifier.py
+#CPOFFWEBSTER
+"""SolutionVerifier: the NumPy lockstep replay agrees with the one-at-a-time walk."""
+
+import pytest
+
+from bloxorz import Board
+from solution_verifier import SolutionVerifier
+
+
+@pytest.mark.parametrize('submissions', [
+    [''],
+    ['', ''],
+    ['', 'RDLULU', 'RRRR', 'LDRULUU', 'R?', 'UUUUU'],
+])
+def test_verify_matches_verify_one(submissions):
+    verifier = SolutionVerifier(Board.load_board('boards/1.blx'))
+    assert verifier.verify(submissions) == [verifier.verify_one(actions) for actions in submissions]
+
+
+def test_empty_submission_is_unfinished():
+    verifier = SolutionVerifier(Board.load_board('boards/1.blx'))
+    assert verifier.verify(['']) == [{'status': 'unfinished', 'step': None, 'length': 0, 'optimal': None}]
+    assert verifier.verify([]) == []